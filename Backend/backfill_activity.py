@@ -0,0 +1,25 @@
+import argparse
+from database.database import SessionLocal
+from utils.activity import backfill_activity
+from utils.logger import logger
+
+def backfill(rebuild=False):
+    db = SessionLocal()
+    try:
+        days = backfill_activity(db, rebuild=rebuild)
+        logger.info(f"Activity rollup backfilled, {days} days written")
+        return days
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error backfilling activity rollup: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the daily activity rollup and recompute the user totals")
+    parser.add_argument("--rebuild", action="store_true", help="Also replace days already recorded, with approximate backfilled counts")
+    args = parser.parse_args()
+    logger.info("Starting activity rollup backfill...")
+    backfill(args.rebuild)
+    logger.info("Activity rollup backfill completed.")
\ No newline at end of file
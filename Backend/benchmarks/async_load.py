@@ -0,0 +1,109 @@
+"""
+Async session load benchmark.
+
+Drives GET /courses/{id} with many concurrent clients, once through the
+AsyncSession route and once through the same lookup on a sync Session (the
+way every async route ran before), and reports requests/sec and latency.
+--db-latency-ms adds a per-statement delay inside the driver to stand in for
+the network round trip to MySQL; SQLite on local disk answers too fast to
+show the event loop blocking.
+
+    python benchmarks/async_load.py --clients 200 --duration 10 --db-latency-ms 2
+"""
+from common import build_app, summarize, Timer
+
+import argparse
+import asyncio
+import sqlite3
+import time
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+from database.database import get_db
+from models.models import Course, CourseLevel, User
+
+def slow_connection_factory(latency_ms):
+    delay = latency_ms / 1000
+
+    class SlowCursor(sqlite3.Cursor):
+        def execute(self, *args):
+            time.sleep(delay)
+            return super().execute(*args)
+
+        def executemany(self, *args):
+            time.sleep(delay)
+            return super().executemany(*args)
+
+    class SlowConnection(sqlite3.Connection):
+        def cursor(self, factory=SlowCursor):
+            return super().cursor(factory)
+
+    return SlowConnection
+
+def add_sync_route(app):
+    # GET /courses/{id} as it was before the port: sync queries on the event loop
+    @app.get("/bench/sync-courses/{course_id}")
+    async def read_course_sync(course_id: int, db: Session = Depends(get_db)):
+        course = db.query(Course).filter(Course.id == course_id).first()
+        if course is None:
+            raise HTTPException(status_code=404, detail="Course not found")
+        return {"id": course.id, "title": course.title}
+
+async def client_worker(client, path, course_ids, deadline, latencies, statuses):
+    i = 0
+    while time.perf_counter() < deadline:
+        with Timer() as t:
+            response = await client.get(path.format(course_ids[i % len(course_ids)]))
+        latencies.append(t.elapsed_ms)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        i += 1
+
+async def drive(app, path, course_ids, args):
+    latencies, statuses = [], {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            client_worker(client, path, course_ids, deadline, latencies, statuses)
+            for _ in range(args.clients)
+        ])
+        elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+async def run(args):
+    # Every connection of both engines pays the simulated round trip
+    connect_args = {"factory": slow_connection_factory(args.db_latency_ms)} if args.db_latency_ms else None
+    app, engine, SessionLocal = build_app(connect_args=connect_args)
+    add_sync_route(app)
+
+    db = SessionLocal()
+    instructor = User(username="bench", email="bench@example.com", hashed_password="x", is_active=True)
+    db.add(instructor)
+    db.flush()
+    db.add_all([
+        Course(title=f"Course {i}", description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+               category="bench", instructor_id=instructor.id)
+        for i in range(args.courses)
+    ])
+    db.commit()
+    course_ids = [course_id for (course_id,) in db.query(Course.id)]
+    db.close()
+
+    results = {}
+    for name, path in (("sync session", "/bench/sync-courses/{}"), ("async session", "/courses/{}")):
+        latencies, statuses, elapsed = await drive(app, path, course_ids, args)
+        results[name] = len(latencies) / elapsed
+        summarize(name, latencies)
+        print(f"  throughput={results[name]:.1f} req/s statuses={statuses}")
+    if results["sync session"]:
+        print(f"async/sync throughput: {results['async session'] / results['sync session']:.2f}x")
+    await app.state.async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--courses", type=int, default=500, help="Courses to seed")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Simulated per-statement round trip")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+import statistics
+import tempfile
+import time
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from database.database import (
+    Base, get_db, get_read_db, get_primary_read_db, get_async_db, get_async_read_db, get_async_primary_read_db,
+    async_database_url
+)
+from routers import auth, courses, enrollments, text_content
+
+def build_app(database_url: str = None, connect_args: dict = None):
+    """
+    Build the API against a throwaway SQLite database so benchmarks can run
+    without a MySQL server. Returns the app, its engine and session factory;
+    the async engine for the same database is app.state.async_engine.
+    `connect_args` go to the DBAPI connect() of both engines.
+    """
+    if database_url is None:
+        db_file = os.path.join(tempfile.mkdtemp(prefix="lms-bench-"), "bench.db")
+        database_url = f"sqlite:///{db_file}"
+
+    # Size the pool above the benchmark's concurrency: the routes run sync
+    # queries on the event loop, so waiting on the pool would stall everything
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False, **(connect_args or {})},
+        pool_size=64,
+        max_overflow=64
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(
+        async_database_url(database_url),
+        connect_args=connect_args or {},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=64,
+        max_overflow=64
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_bench_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_bench_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI(title="LMS API benchmark")
+    app.include_router(auth.router)
+    app.include_router(courses.router)
+    app.include_router(enrollments.router)
+    app.include_router(text_content.router)
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[get_read_db] = get_bench_db
+    app.dependency_overrides[get_primary_read_db] = get_bench_db
+    app.dependency_overrides[get_async_db] = get_bench_async_db
+    app.dependency_overrides[get_async_read_db] = get_bench_async_db
+    app.dependency_overrides[get_async_primary_read_db] = get_bench_async_db
+    app.state.async_engine = async_engine
+
+    # Keep request logging from dominating the measurements
+    logging.getLogger("lms").setLevel(logging.WARNING)
+
+    return app, engine, SessionLocal
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(name, samples_ms):
+    if not samples_ms:
+        print(f"{name}: no samples")
+        return
+    print(
+        f"{name}: n={len(samples_ms)} "
+        f"mean={statistics.mean(samples_ms):.2f}ms "
+        f"p50={percentile(samples_ms, 50):.2f}ms "
+        f"p99={percentile(samples_ms, 99):.2f}ms"
+    )
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
@@ -0,0 +1,84 @@
+"""
+Login throughput benchmark.
+
+Runs concurrent logins against the auth router while a probe client keeps
+hitting GET /courses/, and reports login throughput plus the probe's p99.
+Compare the default pool against --blocking (hashing on the event loop):
+
+    python benchmarks/login_throughput.py --logins 16 --duration 10
+    python benchmarks/login_throughput.py --logins 16 --duration 10 --blocking
+"""
+from common import build_app, summarize, Timer
+
+import argparse
+import asyncio
+import time
+import httpx
+import utils.hashing
+from models.models import User
+from utils.auth import get_password_hash
+from utils.hashing import HashingExecutor
+
+async def login_worker(client, email, deadline, latencies, statuses):
+    while time.perf_counter() < deadline:
+        with Timer() as t:
+            response = await client.post("/auth/login", json={"email": email, "password": "password123"})
+        latencies.append(t.elapsed_ms)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+async def probe_worker(client, deadline, latencies):
+    while time.perf_counter() < deadline:
+        with Timer() as t:
+            await client.get("/courses/")
+        latencies.append(t.elapsed_ms)
+        await asyncio.sleep(0.01)
+
+async def run(args):
+    app, engine, SessionLocal = build_app()
+
+    # Seed one account per login worker, all sharing a single precomputed hash
+    hashed = get_password_hash("password123")
+    db = SessionLocal()
+    emails = []
+    for i in range(args.logins):
+        email = f"bench{i}@example.com"
+        db.add(User(username=f"bench{i}", email=email, hashed_password=hashed, is_active=True))
+        emails.append(email)
+    db.commit()
+    db.close()
+
+    executor = HashingExecutor(kind=args.kind, workers=args.workers, max_queue=args.max_queue)
+    if args.blocking:
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+        executor.run = run_inline
+    utils.hashing.hashing_executor = executor
+
+    login_latencies, probe_latencies, statuses = [], [], {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            probe_worker(client, deadline, probe_latencies),
+            *(login_worker(client, email, deadline, login_latencies, statuses) for email in emails)
+        )
+        elapsed = time.perf_counter() - started
+
+    executor.shutdown()
+
+    mode = "blocking" if args.blocking else f"{args.kind} pool x{args.workers}"
+    print(f"mode: {mode}, concurrent logins: {args.logins}, duration: {elapsed:.1f}s")
+    print(f"login throughput: {statuses.get(200, 0) / elapsed:.1f} successful logins/s, statuses: {statuses}")
+    summarize("login latency", login_latencies)
+    summarize("GET /courses/ latency during logins", probe_latencies)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--kind", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--blocking", action="store_true", help="Hash on the event loop (pre-pool behaviour)")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,72 @@
+"""
+Deep pagination benchmark.
+
+Seeds the courses table and times fetching page N of GET /courses/ in
+offset mode (skip/limit) and in cursor mode (keyset on id).
+
+    python benchmarks/pagination_depth.py --page 1000 --limit 20
+"""
+from common import build_app, summarize, Timer
+
+import argparse
+from fastapi.testclient import TestClient
+from models.models import Course, CourseLevel, User
+from utils.pagination import encode_cursor
+
+def seed(SessionLocal, count):
+    db = SessionLocal()
+    instructor = User(username="bench-instructor", email="instructor@example.com", hashed_password="x")
+    db.add(instructor)
+    db.flush()
+    db.bulk_insert_mappings(Course, [
+        {
+            "title": f"Course {i}",
+            "description": "Benchmark course",
+            "instructor_id": instructor.id,
+            "duration_weeks": 4,
+            "level": CourseLevel.BEGINNER,
+            "category": "benchmark",
+        }
+        for i in range(count)
+    ])
+    db.commit()
+    db.close()
+
+def run(args):
+    app, engine, SessionLocal = build_app()
+    rows = max(args.rows, args.page * args.limit)
+    seed(SessionLocal, rows)
+    client = TestClient(app)
+
+    skip = (args.page - 1) * args.limit
+    # The cursor a client would hold after reading page N-1
+    db = SessionLocal()
+    last_id = db.query(Course.id).order_by(Course.id).offset(skip - 1).limit(1).scalar() if skip else None
+    db.close()
+    cursor = encode_cursor([last_id]) if last_id is not None else None
+
+    offset_samples, cursor_samples = [], []
+    for _ in range(args.repeat):
+        with Timer() as t:
+            offset_page = client.get("/courses/", params={"skip": skip, "limit": args.limit}).json()
+        offset_samples.append(t.elapsed_ms)
+
+        params = {"limit": args.limit, "pagination": "cursor"}
+        if cursor:
+            params["cursor"] = cursor
+        with Timer() as t:
+            cursor_page = client.get("/courses/", params=params).json()
+        cursor_samples.append(t.elapsed_ms)
+
+    same = [c["id"] for c in offset_page["courses"]] == [c["id"] for c in cursor_page["courses"]]
+    print(f"rows: {rows}, page: {args.page}, limit: {args.limit}, pages match: {same}")
+    summarize(f"offset mode (skip={skip})", offset_samples)
+    summarize("cursor mode", cursor_samples)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Courses to seed")
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    run(parser.parse_args())
@@ -0,0 +1,127 @@
+"""
+Text column compression benchmark.
+
+Seeds text contents with plain text, times paging through
+GET /text-contents/, then converts the rows with the batch utility and times
+the same pages again. Reports the bytes stored in the text columns, the
+database file size and request latency for both layouts.
+
+    python benchmarks/text_compression.py --rows 2000 --size 20000 --limit 50
+"""
+from common import build_app, summarize, Timer
+
+import argparse
+import os
+import random
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from models.models import Course, CourseLevel, TextContent, User
+from utils.compression import convert_column
+import utils.compression as compression
+
+WORDS = (
+    "lesson student course module example function variable loop value data "
+    "python query index table result error request response server client"
+).split()
+
+def lesson(rng, size):
+    lines, length = [], 0
+    while length < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + ".\n"
+        lines.append(line)
+        length += len(line)
+    return "".join(lines)
+
+def seed(SessionLocal, rows, size, seed_value):
+    rng = random.Random(seed_value)
+    db = SessionLocal()
+    instructor = User(username="bench-instructor", email="instructor@example.com", hashed_password="x")
+    db.add(instructor)
+    db.flush()
+    db.bulk_insert_mappings(Course, [
+        {
+            "title": f"Course {i}",
+            "description": "Benchmark course",
+            "instructor_id": instructor.id,
+            "duration_weeks": 4,
+            "level": CourseLevel.BEGINNER,
+            "category": "benchmark",
+        }
+        for i in range(rows)
+    ])
+    db.flush()
+    course_ids = [course_id for (course_id,) in db.query(Course.id).order_by(Course.id)]
+    for start in range(0, rows, 500):
+        batch = []
+        for course_id in course_ids[start:start + 500]:
+            raw_text = lesson(rng, size)
+            batch.append({
+                "course_id": course_id,
+                "raw_text": raw_text,
+                "formatted_text": "<div><p>" + raw_text.replace("\n", "</p><p>") + "</p></div>",
+                "version": 1,
+                "published": True,
+            })
+        db.bulk_insert_mappings(TextContent, batch)
+    db.commit()
+    db.close()
+
+def measure(name, client, SessionLocal, engine, args):
+    db = SessionLocal()
+    stored = db.query(func.sum(
+        func.length(TextContent.__table__.c.raw_text) + func.length(TextContent.__table__.c.formatted_text)
+    )).scalar()
+    db.close()
+
+    samples = []
+    for _ in range(args.repeat):
+        cursor = None
+        while True:
+            params = {"limit": args.limit, "pagination": "cursor", "count": "none"}
+            if cursor:
+                params["cursor"] = cursor
+            with Timer() as t:
+                page = client.get("/text-contents/", params=params).json()
+            samples.append(t.elapsed_ms)
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+    db_file = engine.url.database
+    print(f"{name}: {stored / 1024 / 1024:.1f} MiB in text columns, database file {os.path.getsize(db_file) / 1024 / 1024:.1f} MiB")
+    summarize(f"{name} page of {args.limit}", samples)
+    return stored
+
+def run(args):
+    app, engine, SessionLocal = build_app()
+    compression.TEXT_COMPRESSION_ENABLED = False
+    seed(SessionLocal, args.rows, args.size, args.seed)
+    client = TestClient(app)
+
+    plain = measure("plain", client, SessionLocal, engine, args)
+
+    compression.TEXT_COMPRESSION_ENABLED = True
+    db = SessionLocal()
+    with Timer() as t:
+        converted = sum(
+            convert_column(db, column, batch_size=args.batch_size)
+            for column in (TextContent.__table__.c.raw_text, TextContent.__table__.c.formatted_text)
+        )
+    db.close()
+    # Reclaim the pages freed by the rewrite so the file size is comparable
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+    print(f"converted {converted} values in {t.elapsed_ms / 1000:.1f}s")
+
+    compressed = measure("compressed", client, SessionLocal, engine, args)
+    print(f"compressed columns hold {compressed / plain:.1%} of the plain bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Text contents to seed")
+    parser.add_argument("--size", type=int, default=20000, help="Approximate raw_text length")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3, help="Full passes over the table")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    run(parser.parse_args())
@@ -0,0 +1,102 @@
+"""
+Text content history benchmark.
+
+Writes a long lesson through POST /text-contents/ with a few edited lines per
+version, then compares delta-encoded history (a snapshot every N versions)
+with full-copy history (a snapshot for every version): bytes stored and the
+latency of GET /text-contents/{id}/versions/{version}.
+
+    python benchmarks/text_versions.py --lines 2000 --versions 200 --interval 10
+"""
+from common import build_app, summarize, Timer
+
+import argparse
+import random
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from models.models import Course, CourseLevel, TextContentVersion, User
+import utils.text_versions as text_versions
+
+def seed_course(SessionLocal):
+    db = SessionLocal()
+    instructor = User(username="bench-instructor", email="instructor@example.com", hashed_password="x")
+    db.add(instructor)
+    db.flush()
+    course = Course(
+        title="Benchmark course",
+        description="Benchmark course",
+        instructor_id=instructor.id,
+        duration_weeks=4,
+        level=CourseLevel.BEGINNER,
+        category="benchmark"
+    )
+    db.add(course)
+    db.commit()
+    course_id = course.id
+    db.close()
+    return course_id
+
+def edits(args):
+    """The same sequence of lesson revisions for every run."""
+    rng = random.Random(args.seed)
+    lines = [f"Paragraph {i}: " + "lorem ipsum dolor sit amet " * 4 + "\n" for i in range(args.lines)]
+    for version in range(args.versions):
+        if version:
+            for _ in range(args.edits):
+                lines[rng.randrange(len(lines))] = f"Revised in version {version}: " + "consectetur adipiscing elit " * 3 + "\n"
+        raw_text = "".join(lines)
+        yield raw_text, f"<div>{raw_text}</div>"
+
+def run_storage(args, interval):
+    text_versions.TEXT_VERSION_SNAPSHOT_INTERVAL = interval
+    app, engine, SessionLocal = build_app()
+    course_id = seed_course(SessionLocal)
+    client = TestClient(app)
+
+    write_samples = []
+    for raw_text, formatted_text in edits(args):
+        with Timer() as t:
+            response = client.post("/text-contents/", json={
+                "course_id": course_id,
+                "raw_text": raw_text,
+                "formatted_text": formatted_text
+            })
+        write_samples.append(t.elapsed_ms)
+    text_content_id = response.json()["id"]
+
+    db = SessionLocal()
+    stored_bytes = db.query(func.sum(
+        func.length(TextContentVersion.raw_text) + func.length(TextContentVersion.formatted_text)
+    )).scalar()
+    snapshots = db.query(func.count(TextContentVersion.id)).filter(TextContentVersion.is_snapshot == True).scalar()
+    versions = [v for (v,) in db.query(TextContentVersion.version).order_by(TextContentVersion.version)]
+    db.close()
+
+    rng = random.Random(args.seed)
+    read_samples = []
+    for _ in range(args.repeat):
+        version = rng.choice(versions)
+        with Timer() as t:
+            client.get(f"/text-contents/{text_content_id}/versions/{version}")
+        read_samples.append(t.elapsed_ms)
+
+    name = "full copies" if interval == 1 else f"snapshot every {interval}"
+    print(f"{name}: {len(versions)} versions, {snapshots} snapshots, {stored_bytes / 1024:.1f} KiB stored")
+    summarize(f"{name} write", write_samples)
+    summarize(f"{name} fetch", read_samples)
+    return stored_bytes
+
+def run(args):
+    full_bytes = run_storage(args, 1)
+    delta_bytes = run_storage(args, args.interval)
+    print(f"delta history uses {delta_bytes / full_bytes:.1%} of the full-copy storage")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=2000, help="Lines in the lesson")
+    parser.add_argument("--versions", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=3, help="Lines changed per version")
+    parser.add_argument("--interval", type=int, default=10, help="Snapshot interval for the delta run")
+    parser.add_argument("--repeat", type=int, default=200, help="Version fetches to time")
+    parser.add_argument("--seed", type=int, default=7)
+    run(parser.parse_args())
@@ -0,0 +1,39 @@
+import argparse
+from database.database import SessionLocal
+from models.models import CourseContent, TextContent, TextContentVersion
+from utils.compression import convert_column
+from utils.logger import logger
+
+# Columns stored with the CompressedText type
+COMPRESSED_COLUMNS = [
+    TextContent.__table__.c.raw_text,
+    TextContent.__table__.c.formatted_text,
+    TextContentVersion.__table__.c.raw_text,
+    TextContentVersion.__table__.c.formatted_text,
+    CourseContent.__table__.c.content,
+]
+
+def compress_text_columns(batch_size=500, decompress=False):
+    db = SessionLocal()
+    try:
+        total = 0
+        for column in COMPRESSED_COLUMNS:
+            converted = convert_column(db, column, batch_size=batch_size, decompress=decompress)
+            logger.info(f"{column.table.name}.{column.name}: {converted} rows rewritten")
+            total += converted
+        return total
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error converting text columns: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress existing rows of the CompressedText columns in batches")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--decompress", action="store_true", help="Restore plain text, e.g. before turning compression off")
+    args = parser.parse_args()
+    logger.info("Starting text column conversion...")
+    compress_text_columns(args.batch_size, args.decompress)
+    logger.info("Text column conversion completed.")
\ No newline at end of file
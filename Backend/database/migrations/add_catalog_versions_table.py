@@ -0,0 +1,30 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from database.database import SQLALCHEMY_DATABASE_URL
+
+def migrate():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    
+    # SQL to add the catalog_versions table used by the in-memory published catalog
+    sql = """
+    CREATE TABLE IF NOT EXISTS catalog_versions (
+        name VARCHAR(50) NOT NULL PRIMARY KEY,
+        version INT NOT NULL DEFAULT 0,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    );
+    """
+    
+    try:
+        with engine.connect() as connection:
+            connection.execute(text(sql))
+            connection.commit()
+            print("Successfully created 'catalog_versions' table")
+    except Exception as e:
+        print(f"Error creating 'catalog_versions' table: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
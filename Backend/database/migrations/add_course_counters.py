@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from database.database import SQLALCHEMY_DATABASE_URL
+
+def migrate():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    
+    # SQL to add the denormalized enrollment counters and backfill them
+    statements = [
+        """
+        ALTER TABLE courses
+        ADD COLUMN enrollment_count INT NOT NULL DEFAULT 0,
+        ADD COLUMN completion_count INT NOT NULL DEFAULT 0;
+        """,
+        """
+        UPDATE courses c
+        SET c.enrollment_count = (SELECT COUNT(*) FROM enrollments e WHERE e.course_id = c.id),
+            c.completion_count = (SELECT COUNT(*) FROM enrollments e WHERE e.course_id = c.id AND e.completed = TRUE);
+        """,
+    ]
+    
+    try:
+        with engine.connect() as connection:
+            for sql in statements:
+                connection.execute(text(sql))
+            connection.commit()
+            print("Successfully added 'enrollment_count' and 'completion_count' columns to courses table")
+    except Exception as e:
+        print(f"Error adding course counter columns: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
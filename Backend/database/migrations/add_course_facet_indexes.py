@@ -0,0 +1,30 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from database.database import SQLALCHEMY_DATABASE_URL
+
+def migrate():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    
+    # SQL to add the composite indexes used by course filters and facet counts.
+    # (category, level, status) also covers the facet GROUP BY, so it never touches the rows.
+    statements = [
+        "CREATE INDEX ix_courses_category_level_status ON courses (category, level, status);",
+        "CREATE INDEX ix_courses_status_category ON courses (status, category);",
+        "CREATE INDEX ix_courses_level_status ON courses (level, status);",
+    ]
+    
+    try:
+        with engine.connect() as connection:
+            for sql in statements:
+                connection.execute(text(sql))
+            connection.commit()
+            print("Successfully added facet indexes to courses table")
+    except Exception as e:
+        print(f"Error adding facet indexes: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
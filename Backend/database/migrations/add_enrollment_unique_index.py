@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from database.database import SQLALCHEMY_DATABASE_URL
+
+def migrate():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    
+    # SQL to drop duplicate enrollments (keeping the oldest row) and add the unique index
+    statements = [
+        """
+        DELETE e1 FROM enrollments e1
+        JOIN enrollments e2
+          ON e1.user_id = e2.user_id
+         AND e1.course_id = e2.course_id
+         AND e1.id > e2.id;
+        """,
+        """
+        ALTER TABLE enrollments
+        ADD UNIQUE INDEX uq_enrollments_user_course (user_id, course_id);
+        """,
+    ]
+    
+    try:
+        with engine.connect() as connection:
+            for sql in statements:
+                connection.execute(text(sql))
+            connection.commit()
+            print("Successfully added unique (user_id, course_id) index to enrollments table")
+    except Exception as e:
+        print(f"Error adding enrollments unique index: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
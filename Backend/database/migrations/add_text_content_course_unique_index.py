@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from database.database import SQLALCHEMY_DATABASE_URL
+
+def migrate():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    
+    # SQL to drop duplicate text contents (keeping the newest row per course) and add the unique index
+    statements = [
+        """
+        DELETE t1 FROM text_contents t1
+        JOIN text_contents t2
+          ON t1.course_id = t2.course_id
+         AND t1.id < t2.id;
+        """,
+        """
+        ALTER TABLE text_contents
+        ADD UNIQUE INDEX uq_text_contents_course (course_id);
+        """,
+    ]
+    
+    try:
+        with engine.connect() as connection:
+            for sql in statements:
+                connection.execute(text(sql))
+            connection.commit()
+            print("Successfully added unique (course_id) index to text_contents table")
+    except Exception as e:
+        print(f"Error adding text_contents unique index: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
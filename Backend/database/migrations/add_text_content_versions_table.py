@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, text
+from database.database import SQLALCHEMY_DATABASE_URL
+
+def migrate():
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    
+    # SQL to add the text content history table (full snapshots plus deltas)
+    sql = """
+    CREATE TABLE IF NOT EXISTS text_content_versions (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        text_content_id INT NOT NULL,
+        version INT NOT NULL,
+        is_snapshot BOOLEAN NOT NULL DEFAULT FALSE,
+        raw_text TEXT,
+        formatted_text TEXT,
+        formatting_options JSON,
+        published BOOLEAN DEFAULT FALSE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_text_content_versions_version (text_content_id, version),
+        FOREIGN KEY (text_content_id) REFERENCES text_contents(id) ON DELETE CASCADE
+    );
+    """
+    
+    try:
+        with engine.connect() as connection:
+            connection.execute(text(sql))
+            connection.commit()
+            print("Successfully created 'text_content_versions' table")
+    except Exception as e:
+        print(f"Error creating 'text_content_versions' table: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
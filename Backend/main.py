@@ -1,36 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
-import os
-from routers import auth, courses, enrollments, text_content
-from database.database import Base
+from routers import auth, courses, enrollments, text_content, search, instructors, admin
+from database.database import Base, engine, MYSQL_HOST, MYSQL_PORT, MYSQL_DATABASE
 from utils.logger import logger
+from utils.hashing import hashing_executor
+from utils.search_index import rebuild_search_index
+from utils.progress_buffer import progress_buffer
+from utils.query_stats import QueryStatsMiddleware
+import database.database
 
 # Load environment variables
 load_dotenv()
 logger.info("Starting LMS API application")
 
-# Database configuration
-MYSQL_USER = os.getenv("MYSQL_USER", "root")
-MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "root")
-MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
-MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
-MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "lms_db")
-
-# Create SQLAlchemy engine
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# The engine, sessions and pool settings all come from database/database.py
 logger.info(f"Database connection established to {MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}")
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create Base class
-Base = declarative_base()
-
 # Create FastAPI app
 app = FastAPI(
     title="LMS API",
@@ -50,21 +36,19 @@ app.add_middleware(
 )
 logger.info("CORS middleware configured")
 
+# Query count and DB time per request, as a Server-Timing header
+app.add_middleware(QueryStatsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(courses.router)
 app.include_router(enrollments.router)
 app.include_router(text_content.router)
+app.include_router(search.router)
+app.include_router(instructors.router)
+app.include_router(admin.router)
 logger.info("API routers included")
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @app.get("/")
 async def root():
     logger.info("Root endpoint accessed")
@@ -74,6 +58,26 @@ async def root():
         "redoc_url": "/redoc"
     }
 
+@app.on_event("startup")
+def build_search_index():
+    db = database.database.SessionLocal()
+    try:
+        rebuild_search_index(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def start_progress_buffer():
+    progress_buffer.start()
+
+@app.on_event("shutdown")
+async def flush_progress_buffer():
+    await progress_buffer.stop()
+
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    hashing_executor.shutdown()
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 logger.info("Database tables created successfully")
\ No newline at end of file
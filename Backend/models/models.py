@@ -1,11 +1,12 @@
 #models/models.py
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Float,Enum, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, Float,Enum, Text, Date, DateTime, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from database.database import Base
 from enum import Enum as PyEnum
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.sql import func
 from sqlalchemy import Enum as SQLEnum
+from utils.compression import CompressedText
 
 class UserRole(str, PyEnum):
     USER = "USER"
@@ -30,7 +31,7 @@ class CourseContent(Base):
     title = Column(String(200), nullable=False)
     description = Column(Text)
     content_type = Column(SQLEnum(ContentType, name="contenttype"), nullable=False)
-    content = Column(Text)  # For lessons, this could be HTML content
+    content = Column(CompressedText)  # For lessons, this could be HTML content
     order = Column(Integer, nullable=False)  # For ordering content within a course
     duration_minutes = Column(Integer)  # Estimated duration in minutes
     is_published = Column(Boolean, default=False)
@@ -45,6 +46,10 @@ class CourseContent(Base):
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # Duplicate enrollments are rejected by the database (see database/migrations/add_enrollment_unique_index.py)
+        UniqueConstraint("user_id", "course_id", name="uq_enrollments_user_course"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -115,6 +120,12 @@ class CourseStatus(str, PyEnum):
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        # Catalog filters and the facet GROUP BY (see database/migrations/add_course_facet_indexes.py)
+        Index("ix_courses_category_level_status", "category", "level", "status"),
+        Index("ix_courses_status_category", "status", "category"),
+        Index("ix_courses_level_status", "level", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -124,6 +135,9 @@ class Course(Base):
     level = Column(SQLEnum(CourseLevel, name="courselevel"), nullable=False)
     category = Column(String(50), nullable=False)
     status = Column(SQLEnum(CourseStatus, name="coursestatus"), default=CourseStatus.DRAFT)
+    # Denormalized counters kept in step by the enrollment routes (see reconcile_counters.py)
+    enrollment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completion_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -135,11 +149,15 @@ class Course(Base):
 
 class TextContent(Base):
     __tablename__ = "text_contents"
+    __table_args__ = (
+        # One text content per course; saves upsert on it (see database/migrations/add_text_content_course_unique_index.py)
+        UniqueConstraint("course_id", name="uq_text_contents_course"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
-    raw_text = Column(Text)
-    formatted_text = Column(Text)
+    raw_text = Column(CompressedText)
+    formatted_text = Column(CompressedText)
     formatting_options = Column(JSON)
     version = Column(Integer, nullable=False, default=1)
     published = Column(Boolean, default=False)
@@ -150,4 +168,55 @@ class TextContent(Base):
     course = relationship("Course", back_populates="text_contents")
 
     def __repr__(self):
-        return f"<TextContent {self.id}: Version {self.version}>"
\ No newline at end of file
+        return f"<TextContent {self.id}: Version {self.version}>"
+
+class TextContentVersion(Base):
+    __tablename__ = "text_content_versions"
+    __table_args__ = (
+        UniqueConstraint("text_content_id", "version", name="uq_text_content_versions_version"),
+    )
+
+    # Snapshot rows hold the full text; the rest hold a delta against the
+    # previous version (see utils/text_versions.py)
+    id = Column(Integer, primary_key=True, index=True)
+    text_content_id = Column(Integer, ForeignKey("text_contents.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    raw_text = Column(CompressedText)
+    formatted_text = Column(CompressedText)
+    formatting_options = Column(JSON)
+    published = Column(Boolean, default=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<TextContentVersion {self.text_content_id}: Version {self.version}>"
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+
+    # One row per in-memory snapshot, bumped in the same transaction as the write
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CatalogVersion {self.name}: {self.version}>"
+
+class DailyActivity(Base):
+    __tablename__ = "daily_activity"
+
+    # One row per UTC day, incremented by the write paths and rebuilt by backfill_activity.py
+    day = Column(Date, primary_key=True)
+    signups = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)  # Distinct users who logged in that day
+    logins = Column(Integer, nullable=False, default=0)
+    enrollments = Column(Integer, nullable=False, default=0)
+    completions = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class ActivityTotal(Base):
+    __tablename__ = "activity_totals"
+
+    # Running totals kept next to the daily rollup, e.g. total_users and active_users
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
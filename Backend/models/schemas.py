@@ -1,8 +1,9 @@
 #models/scheams
-from pydantic import BaseModel, EmailStr, field_validator,ConfigDict
+from pydantic import BaseModel, EmailStr, field_validator,ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from models.models import EnrollmentStatus, CourseLevel, CourseStatus
 
 
 class UserRole(str, Enum):
@@ -106,3 +107,31 @@ class Enrollment(EnrollmentBase):
     class Config:
         from_attributes = True
 
+class MyEnrollment(EnrollmentBase):
+    id: int
+    status: Optional[EnrollmentStatus] = None
+    completed: bool
+    created_at: Optional[datetime] = None
+    course_title: str
+    course_level: CourseLevel
+    course_status: Optional[CourseStatus] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class PaginatedEnrollmentResponse(BaseModel):
+    limit: int
+    enrollments: List[MyEnrollment]
+    next_cursor: Optional[str] = None
+
+class ProgressReport(EnrollmentBase):
+    progress: float = Field(..., ge=0, le=100)
+
+class BulkEnrollmentCreate(EnrollmentBase):
+    user_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+class BulkEnrollmentResult(EnrollmentBase):
+    requested: int
+    enrolled: int
+    already_enrolled: int
+    unknown_user_ids: List[int]
+
@@ -0,0 +1,21 @@
+from database.database import SessionLocal
+from utils.course_counters import reconcile_course_counters
+from utils.logger import logger
+
+def reconcile_counters():
+    db = SessionLocal()
+    try:
+        repaired = reconcile_course_counters(db)
+        logger.info(f"Course counters reconciled, {repaired} courses repaired")
+        return repaired
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error reconciling course counters: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    logger.info("Starting course counter reconciliation...")
+    reconcile_counters()
+    logger.info("Course counter reconciliation completed.")
\ No newline at end of file
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from models.models import User
+from utils.auth import get_current_admin_user, principal_cache
+from utils.counts import count_cache
+from utils.dashboards import dashboard_cache
+from utils.enrollment_cache import my_enrollments_cache
+from utils.pool_metrics import pool_stats
+from utils.query_stats import endpoint_query_stats
+from utils.rendering import render_cache
+from utils.search_index import search_index_sync
+import database.database
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+@router.get("/db/pool")
+async def read_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    # Live occupancy and checkout wait times of the sync and async connection
+    # pools, plus how reads are spread over the replicas
+    return {
+        "sync": pool_stats(database.database.engine),
+        "async": pool_stats(database.database.async_engine.sync_engine),
+        "replicas": database.database.replica_router.stats(),
+    }
+
+@router.get("/db/queries")
+async def read_query_stats(
+    reset: bool = False,
+    current_user: User = Depends(get_current_admin_user)
+):
+    # Queries and DB time per endpoint, most queries per request first
+    endpoints = endpoint_query_stats.snapshot()
+    if reset:
+        endpoint_query_stats.reset()
+    return {"endpoints": endpoints}
+
+@router.get("/caches")
+async def read_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    # Size, hits and misses of this worker's in-process caches
+    return {
+        "principals": principal_cache.stats(),
+        "counts": count_cache.stats(),
+        "dashboards": dashboard_cache.stats(),
+        "my_enrollments": my_enrollments_cache.stats(),
+        "rendering": render_cache.stats(),
+    }
+
+@router.get("/search")
+async def read_search_index_stats(current_user: User = Depends(get_current_admin_user)):
+    # Size of this worker's index and how far it has caught up with the database
+    return search_index_sync.stats()
@@ -1,23 +1,30 @@
 # routers/auth
 from fastapi import APIRouter, Depends, HTTPException, status, Form, Body, Query
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
 from models.models import User, UserRole
-from schemas.schemas import UserCreate, User as UserSchema
+from schemas.schemas import UserCreate, User as UserSchema, ActivitySeriesResponse
 from utils.auth import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    get_current_active_user
+    get_current_active_user,
+    get_current_admin_user,
+    invalidate_principal,
+    bump_principal_version
 )
-from database.database import get_db
+from utils.hashing import verify_password_async, get_password_hash_async
+from database.database import get_db, get_read_db, get_primary_read_db, get_async_db
 from utils.logger import logger
+from utils.pagination import paginate, OFFSET_MODE, PAGINATION_MODE_PATTERN
+from utils.counts import resolve_total, invalidate_counts, COUNT_EXACT, COUNT_MODE_PATTERN
+from utils.fields import parse_fields, sparse_query, sparse_rows, FIELDS_DESCRIPTION
+from utils.activity import record_activity, adjust_totals, user_statistics, activity_series, today
 from pydantic import BaseModel, EmailStr
 import traceback
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy import func, select
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.exc import IntegrityError
 
 # Custom login form for email-based login
@@ -31,11 +38,11 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=UserSchema)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     logger.info(f"Attempting to register new user with email: {user.email}")
     
     # Check if email exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = (await db.execute(select(User.id).where(User.email == user.email))).first()
     if db_user:
         logger.warning(f"Registration failed: Email {user.email} already registered")
         raise HTTPException(
@@ -44,7 +51,7 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if username exists
-    db_user = db.query(User).filter(User.username == user.username).first()
+    db_user = (await db.execute(select(User.id).where(User.username == user.username))).first()
     if db_user:
         logger.warning(f"Registration failed: Username {user.username} already taken")
         raise HTTPException(
@@ -52,9 +59,11 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
             detail="Username already taken"
         )
     
+    # Hash outside the try block so a saturated hashing pool surfaces as 503
+    hashed_password = await get_password_hash_async(user.password)
+
     try:
         # Create new user
-        hashed_password = get_password_hash(user.password)
         db_user = User(
             email=user.email,
             username=user.username,
@@ -64,12 +73,15 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
             role=user.role
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.run_sync(record_activity, signups=1)
+        await db.run_sync(adjust_totals, total_users=1, active_users=1)
+        await db.commit()
+        await db.refresh(db_user)
+        invalidate_counts("users")
         logger.info(f"Successfully registered new user: {user.username} with role: {user.role}")
         return db_user
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         error_msg = f"Error during user registration: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_msg)
         raise HTTPException(
@@ -80,12 +92,12 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login")
 async def login(
     login_data: EmailPasswordForm = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Login attempt for email: {login_data.email}")
     
     try:
-        user = db.query(User).filter(User.email == login_data.email).first()
+        user = (await db.scalars(select(User).where(User.email == login_data.email))).first()
         
         # Check if user exists
         if not user:
@@ -118,7 +130,7 @@ async def login(
             )
         
         # Verify password
-        if not verify_password(login_data.password, user.hashed_password):
+        if not await verify_password_async(login_data.password, user.hashed_password):
             # Increment failed login attempts
             user.failed_login_attempts += 1
             
@@ -131,7 +143,7 @@ async def login(
                 error_msg = f"Failed login attempt for user {user.username} (email: {user.email}): Invalid password. Attempt {user.failed_login_attempts} of 5"
                 logger.warning(error_msg)
             
-            db.commit()
+            await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -139,9 +151,11 @@ async def login(
             )
         
         # Reset failed login attempts on successful login
+        first_login_today = user.last_login is None or user.last_login.date() != today()
         user.failed_login_attempts = 0
         user.last_login = datetime.utcnow()
-        db.commit()
+        await db.run_sync(record_activity, logins=1, active_users=1 if first_login_today else 0)
+        await db.commit()
         
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -176,44 +190,52 @@ async def read_users_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 @router.get("/statistics")
-async def get_user_statistics(db: Session = Depends(get_db)):
+async def get_user_statistics(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin_user)
+):
     logger.info("Fetching user statistics")
     
-    # Get current date and first day of current month
-    current_date = datetime.utcnow()
-    first_day_of_month = current_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    # Total Users (both ADMIN and USER)
-    total_users = db.query(func.count(User.id)).scalar()
-    
-    # Active Users (both ADMIN and USER)
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
-    
-    # New Users this month (both ADMIN and USER)
-    new_users_this_month = db.query(func.count(User.id)).filter(
-        User.created_at >= first_day_of_month
-    ).scalar()
-    
-    statistics = {
-        "total_users": total_users,
-        "active_users": active_users,
-        "new_users_this_month": new_users_this_month
-    }
+    # Answered from the rollup tables, so the cost doesn't grow with the users table
+    statistics = user_statistics(db)
     
     logger.info(f"User statistics retrieved successfully: {statistics}")
     return statistics
 
+@router.get("/statistics/daily", response_model=ActivitySeriesResponse)
+async def get_daily_activity(
+    start: Optional[date] = Query(None, description="First day, defaults to 29 days before end"),
+    end: Optional[date] = Query(None, description="Last day, defaults to today (UTC)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    end = end or today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    if (end - start).days >= 366:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Range is limited to 366 days")
+
+    return ActivitySeriesResponse(start=start, end=end, days=activity_series(db, start, end))
+
 class PaginatedUserResponse(BaseModel):
-    total: int
+    total: Optional[int]
     skip: int
     limit: int
-    users: List[UserSchema]
+    # Rows are partial dicts when the request names `fields`
+    users: List[Union[UserSchema, Dict[str, Any]]]
+    next_cursor: Optional[str] = None
 
 @router.get("/users", response_model=PaginatedUserResponse)
 async def get_all_users(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to return"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page; implies cursor pagination"),
+    pagination: str = Query(OFFSET_MODE, pattern=PAGINATION_MODE_PATTERN, description="offset or cursor"),
+    count: str = Query(COUNT_EXACT, pattern=COUNT_MODE_PATTERN, description="exact, estimate or none"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    primary_db: Session = Depends(get_primary_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     # Check if current user is admin
@@ -226,11 +248,15 @@ async def get_all_users(
     
     logger.info(f"Admin {current_user.username} is fetching all users")
     
-    # Get total count
-    total_users = db.query(func.count(User.id)).scalar()
+    # Get total count; cached, so read from the primary
+    total_users = resolve_total(primary_db, count, "users", lambda: primary_db.query(func.count(User.id)).scalar())
     
-    # Get users with pagination
-    users = db.query(User).offset(skip).limit(limit).all()
+    # Get users with pagination, selecting only the requested columns
+    selected_fields = parse_fields(fields, list(UserSchema.model_fields))
+    query = sparse_query(db, User, selected_fields) if selected_fields else db.query(User)
+    users, next_cursor = paginate(query, (User.id,), skip, limit, cursor, pagination)
+    if selected_fields:
+        users = sparse_rows(users, selected_fields)
     
     logger.info(f"Retrieved {len(users)} users out of {total_users} total users")
     
@@ -238,7 +264,8 @@ async def get_all_users(
         total=total_users,
         skip=skip,
         limit=limit,
-        users=users
+        users=users,
+        next_cursor=next_cursor
     )
 
 class UserUpdate(BaseModel):
@@ -279,6 +306,8 @@ async def update_user(
             detail="Not authorized to change user role"
         )
 
+    previous_username = db_user.username
+
     try:
         # Update user fields if provided
         if user_update.email is not None:
@@ -304,16 +333,24 @@ async def update_user(
             db_user.username = user_update.username
 
         if user_update.password is not None:
-            db_user.hashed_password = get_password_hash(user_update.password)
+            db_user.hashed_password = await get_password_hash_async(user_update.password)
 
         if user_update.is_active is not None and current_user.is_admin():
+            was_active = db_user.is_active
             db_user.is_active = user_update.is_active
+            if user_update.is_active != was_active:
+                adjust_totals(db, active_users=1 if user_update.is_active else -1)
 
         if user_update.role is not None and current_user.is_admin():
             db_user.role = user_update.role
 
+        bump_principal_version(db)
         db.commit()
         db.refresh(db_user)
+
+        # Drop cached principals so role/active/username changes apply immediately
+        invalidate_principal(previous_username, db_user.username)
+        invalidate_counts("users")
         
         logger.info(f"Successfully updated user {db_user.username}")
         return db_user
@@ -365,8 +402,13 @@ async def delete_user(
         username = db_user.username
         
         # Delete the user
+        was_active = db_user.is_active
         db.delete(db_user)
+        adjust_totals(db, total_users=-1, active_users=-1 if was_active else 0)
+        bump_principal_version(db)
         db.commit()
+        invalidate_principal(username)
+        invalidate_counts("users")
         
         logger.info(f"User {username} (ID: {user_id}) successfully deleted by admin {current_user.username}")
         return {
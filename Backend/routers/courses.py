@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from models.models import User, Course, CourseStatus
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload, load_only
+from sqlalchemy import func, insert, select
+from pydantic import ValidationError
+from typing import List, Optional
+import asyncio
+import json
+import os
+from models.models import User, Course, CourseStatus, CourseLevel, CourseContent, Enrollment, TextContent
 from schemas.schemas import (
     Course as CourseSchema,
     CourseCreate,
@@ -10,17 +16,72 @@ from schemas.schemas import (
     Lesson as LessonSchema,
     LessonCreate,
     LessonUpdate,
-    PaginatedCourseResponse
+    PaginatedCourseResponse,
+    CourseImportResult,
+    CourseOverview,
+    TextContentOut,
+    PopularCoursesResponse
 )
 from utils.auth import get_current_active_user
-from database.database import get_db
+from database.database import get_db, get_read_db, get_async_read_db, get_async_primary_read_db
 from utils.logger import logger
+from utils.pagination import paginate, OFFSET_MODE, CURSOR_MODE, PAGINATION_MODE_PATTERN
+from utils.counts import resolve_total, invalidate_counts, count_cache, COUNT_EXACT, COUNT_NONE, COUNT_MODE_PATTERN
+from utils.catalog import published_catalog, bump_catalog_version
+from utils.etag import make_etag, etag_matches, not_modified
+from utils.search_index import index_course, remove_course
+from utils.dashboards import invalidate_instructor_dashboard
+from utils.course_counters import popular_courses, POPULAR_MAX_K
+from utils.fields import parse_fields, sparse_query, sparse_rows, FIELDS_DESCRIPTION
 
 router = APIRouter(
     prefix="/courses",
     tags=["courses"]
 )
 
+FACET_DIMENSIONS = ("category", "level", "status")
+
+# Bulk import/export tuning
+COURSE_IMPORT_BATCH_SIZE = int(os.getenv("COURSE_IMPORT_BATCH_SIZE", "500"))
+COURSE_IMPORT_MAX_ERRORS = int(os.getenv("COURSE_IMPORT_MAX_ERRORS", "1000"))
+COURSE_EXPORT_BATCH_SIZE = int(os.getenv("COURSE_EXPORT_BATCH_SIZE", "1000"))
+
+def _facet_groups(db: Session) -> list:
+    """
+    (category, level, status, count) for every combination, from a single
+    GROUP BY. Cached alongside the course counts, so course writes clear it.
+    """
+    key = ("courses", "facet_groups")
+    groups = count_cache.get(key)
+    if groups is None:
+        rows = db.query(
+            Course.category, Course.level, Course.status, func.count(Course.id)
+        ).group_by(Course.category, Course.level, Course.status).all()
+        groups = [
+            (category, level.value if level else None, course_status.value if course_status else None, total)
+            for category, level, course_status, total in rows
+        ]
+        count_cache.set(key, groups)
+    return groups
+
+def _matches(values: dict, filters: dict, skip_dimension: Optional[str] = None) -> bool:
+    return all(
+        filters[dimension] is None or values[dimension] == filters[dimension]
+        for dimension in FACET_DIMENSIONS if dimension != skip_dimension
+    )
+
+def _facet_counts(groups: list, filters: dict) -> dict:
+    # Each dimension is counted under the other dimensions' filters, so a
+    # selected category still reports how many courses its siblings have
+    facets = {dimension: {} for dimension in FACET_DIMENSIONS}
+    for *group_values, total in groups:
+        values = dict(zip(FACET_DIMENSIONS, group_values))
+        for dimension in FACET_DIMENSIONS:
+            value = values[dimension]
+            if value is not None and _matches(values, filters, skip_dimension=dimension):
+                facets[dimension][value] = facets[dimension].get(value, 0) + total
+    return facets
+
 # Course endpoints
 @router.post("/", response_model=CourseSchema)
 async def create_course(
@@ -33,26 +94,69 @@ async def create_course(
         instructor_id=current_user.id
     )
     db.add(db_course)
+    catalog_version = bump_catalog_version(db) if db_course.status == CourseStatus.PUBLISHED else None
     db.commit()
     db.refresh(db_course)
+    invalidate_counts("courses")
+    invalidate_instructor_dashboard(current_user.id)
+    index_course(db_course)
+    if catalog_version is not None:
+        published_catalog.apply(db_course.id, db_course, catalog_version)
+        popular_courses.apply(db_course.id, db_course)
     return db_course
 
 @router.get("/", response_model=PaginatedCourseResponse)
 async def read_courses(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page; implies cursor pagination"),
+    pagination: str = Query(OFFSET_MODE, pattern=PAGINATION_MODE_PATTERN, description="offset or cursor"),
+    count: str = Query(COUNT_EXACT, pattern=COUNT_MODE_PATTERN, description="exact, estimate or none"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    level: Optional[CourseLevel] = Query(None, description="Filter by level"),
+    course_status: Optional[CourseStatus] = Query(None, alias="status", description="Filter by status"),
+    facets: bool = Query(True, description="Include facet counts for category, level and status"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_primary_read_db)
 ):
     """
     Get all courses with pagination.
-    Returns a paginated list of courses with all fields.
+    Returns a paginated list of courses, optionally filtered by category,
+    level and status, plus facet counts for each dimension. `fields` limits
+    both the columns selected and the fields returned.
     """
+    selected_fields = parse_fields(fields, list(CourseSchema.model_fields))
     try:
-        # Get total count
-        total_courses = db.query(func.count(Course.id)).scalar()
-        
+        filters = {
+            "category": category,
+            "level": level.value if level else None,
+            "status": course_status.value if course_status else None,
+        }
+
+        # Totals and facets both come from the one grouped aggregate, cached
+        # and so read from the primary
+        groups = await primary_db.run_sync(_facet_groups) if facets or count != COUNT_NONE else []
+        total_courses = await primary_db.run_sync(lambda session: resolve_total(
+            session, count, "courses",
+            lambda: sum(group[-1] for group in groups if _matches(dict(zip(FACET_DIMENSIONS, group)), filters)),
+            filter_key="&".join(f"{name}={value}" for name, value in filters.items() if value is not None)
+        ))
+
+        def course_page(session: Session):
+            query = sparse_query(session, Course, selected_fields) if selected_fields else session.query(Course)
+            if category is not None:
+                query = query.filter(Course.category == category)
+            if level is not None:
+                query = query.filter(Course.level == level)
+            if course_status is not None:
+                query = query.filter(Course.status == course_status)
+            return paginate(query, (Course.id,), skip, limit, cursor, pagination)
+
         # Get courses with pagination
-        courses = db.query(Course).offset(skip).limit(limit).all()
+        courses, next_cursor = await db.run_sync(course_page)
+        if selected_fields:
+            courses = sparse_rows(courses, selected_fields)
         
         logger.info(f"Retrieved {len(courses)} courses out of {total_courses} total courses")
         
@@ -60,8 +164,12 @@ async def read_courses(
             total=total_courses,
             skip=skip,
             limit=limit,
-            courses=courses
+            courses=courses,
+            next_cursor=next_cursor,
+            facets=_facet_counts(groups, filters) if facets else None
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching courses: {str(e)}")
         raise HTTPException(
@@ -69,15 +177,247 @@ async def read_courses(
             detail="Error fetching courses"
         )
 
+@router.get("/published", response_model=PaginatedCourseResponse)
+async def get_published_courses(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page; implies cursor pagination"),
+    pagination: str = Query(OFFSET_MODE, pattern=PAGINATION_MODE_PATTERN, description="offset or cursor"),
+    count: str = Query(COUNT_EXACT, pattern=COUNT_MODE_PATTERN, description="exact, estimate or none"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_primary_read_db)
+):
+    """
+    Get all published courses with pagination.
+    Served from the in-memory published catalog snapshot, which only ever
+    reloads from the primary.
+    """
+    try:
+        await db.run_sync(published_catalog.ensure_fresh)
+
+        # Every change to a published course bumps the catalog version
+        etag = make_etag("published", published_catalog.version, skip, limit, cursor, pagination, count)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+
+        courses, next_cursor = published_catalog.page(skip, limit, cursor, keyset=pagination == CURSOR_MODE)
+        total_courses = None if count == COUNT_NONE else published_catalog.total()
+        response.headers["X-Catalog-Version"] = str(published_catalog.version)
+
+        logger.info(f"Retrieved {len(courses)} published courses out of {published_catalog.total()} total published courses")
+        
+        return PaginatedCourseResponse(
+            total=total_courses,
+            skip=skip,
+            limit=limit,
+            courses=courses,
+            next_cursor=next_cursor
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching published courses: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching published courses"
+        )
+
+async def _ndjson_lines(request: Request):
+    # Split the body into lines as it arrives instead of buffering the whole upload
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+@router.post("/import", response_model=CourseImportResult)
+async def import_courses(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Bulk-create courses from an NDJSON body, one CourseCreate object per line.
+    Valid rows are inserted in multi-row batches; invalid rows are reported by
+    line number and skipped. The session is sync, so every database step runs
+    in a worker thread and the event loop keeps serving other requests.
+    """
+    imported = 0
+    failed = 0
+    errors = []
+    batch = []
+    batch_lines = []
+    catalog_changed = False
+    first_new_id = await asyncio.to_thread(lambda: (db.query(func.max(Course.id)).scalar() or 0) + 1)
+
+    def record_error(line_number, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < COURSE_IMPORT_MAX_ERRORS:
+            errors.append({"line": line_number, "error": message})
+
+    def flush_batch():
+        nonlocal imported, catalog_changed
+        if not batch:
+            return
+        try:
+            has_published = any(row["status"] == CourseStatus.PUBLISHED for row in batch)
+            db.execute(insert(Course), batch)
+            if has_published:
+                bump_catalog_version(db)
+            db.commit()
+            imported += len(batch)
+            catalog_changed = catalog_changed or has_published
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error importing course batch: {str(e)}")
+            for line_number in batch_lines:
+                record_error(line_number, "Database error while inserting this batch")
+        batch.clear()
+        batch_lines.clear()
+
+    line_number = 0
+    async for line in _ndjson_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            course = CourseCreate.model_validate(json.loads(line))
+        except ValidationError as e:
+            record_error(line_number, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+            continue
+        except ValueError as e:
+            record_error(line_number, f"Invalid JSON: {str(e)}")
+            continue
+
+        batch.append({**course.model_dump(), "instructor_id": current_user.id})
+        batch_lines.append(line_number)
+        if len(batch) >= COURSE_IMPORT_BATCH_SIZE:
+            await asyncio.to_thread(flush_batch)
+    await asyncio.to_thread(flush_batch)
+
+    def index_new_courses():
+        new_courses = db.query(Course).filter(
+            Course.id >= first_new_id,
+            Course.instructor_id == current_user.id
+        )
+        for db_course in new_courses.yield_per(COURSE_IMPORT_BATCH_SIZE):
+            index_course(db_course)
+
+    if imported:
+        invalidate_counts("courses")
+        invalidate_instructor_dashboard(current_user.id)
+        if catalog_changed:
+            published_catalog.mark_stale()
+            popular_courses.mark_stale()
+        await asyncio.to_thread(index_new_courses)
+
+    logger.info(f"User {current_user.username} imported {imported} courses, {failed} rows failed")
+    return CourseImportResult(imported=imported, failed=failed, errors=errors)
+
+@router.get("/popular", response_model=PopularCoursesResponse)
+async def get_popular_courses(
+    limit: int = Query(10, ge=1, le=POPULAR_MAX_K, description="Number of courses to return"),
+    db: AsyncSession = Depends(get_async_primary_read_db)
+):
+    """
+    Published courses with the most enrollments, served from the in-memory
+    ranking that the enrollment routes keep up to date.
+    """
+    await db.run_sync(popular_courses.ensure_fresh)
+    return PopularCoursesResponse(limit=limit, courses=popular_courses.top(limit))
+
+@router.get("/export")
+async def export_courses(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream courses as NDJSON through a server-side cursor, so memory stays
+    flat regardless of catalog size. Admins export every course, other users
+    their own.
+    """
+    query = db.query(Course).order_by(Course.id)
+    if not current_user.is_admin():
+        query = query.filter(Course.instructor_id == current_user.id)
+    # yield_per also turns on stream_results, i.e. an unbuffered server-side cursor
+    query = query.yield_per(COURSE_EXPORT_BATCH_SIZE)
+
+    def generate():
+        for db_course in query:
+            yield CourseSchema.model_validate(db_course).model_dump_json() + "\n"
+            # Rows already written out don't need to stay in the identity map
+            db.expunge(db_course)
+
+    logger.info(f"User {current_user.username} started a course export")
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @router.get("/{course_id}", response_model=CourseSchema)
 async def read_course(
     course_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = await db.get(Course, course_id)
     if course is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+
+    # Hashed from the representation itself: updated_at only has one-second
+    # resolution, so two edits within a second would share a timestamp ETag
+    representation = CourseSchema.model_validate(course)
+    etag = make_etag("course", representation.model_dump(mode="json"))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return representation
+
+@router.get("/{course_id}/overview", response_model=CourseOverview)
+async def read_course_overview(
+    course_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Everything the course page needs in one response: the course, its
+    instructor, published text content, enrollment count and content outline.
+    Always three queries, however large the course is.
+    """
+    enrollment_count = (
+        select(func.count(Enrollment.id))
+        .where(Enrollment.course_id == Course.id)
+        .correlate(Course)
+        .scalar_subquery()
+    )
+    result = await db.execute(select(Course, enrollment_count.label("enrollment_count")).options(
+        joinedload(Course.instructor).load_only(User.id, User.username),
+        selectinload(Course.text_contents.and_(TextContent.published == True)),
+        selectinload(Course.contents.and_(CourseContent.is_published == True)).load_only(
+            CourseContent.id,
+            CourseContent.title,
+            CourseContent.content_type,
+            CourseContent.order,
+            CourseContent.duration_minutes
+        )
+    ).where(Course.id == course_id))
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    course, total_enrollments = row
+    return CourseOverview(
+        course=course,
+        instructor=course.instructor,
+        text_contents=[TextContentOut.model_validate(tc, from_attributes=True) for tc in course.text_contents],
+        enrollment_count=total_enrollments,
+        outline=sorted(course.contents, key=lambda content: content.order)
+    )
 
 @router.put("/{course_id}", response_model=CourseSchema)
 async def update_course(
@@ -92,11 +432,21 @@ async def update_course(
     if db_course.instructor_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this course")
 
+    was_published = db_course.status == CourseStatus.PUBLISHED
     for key, value in course.dict(exclude_unset=True).items():
         setattr(db_course, key, value)
 
+    catalog_version = None
+    if was_published or db_course.status == CourseStatus.PUBLISHED:
+        catalog_version = bump_catalog_version(db)
     db.commit()
     db.refresh(db_course)
+    invalidate_counts("courses")
+    invalidate_instructor_dashboard(current_user.id)
+    index_course(db_course)
+    if catalog_version is not None:
+        published_catalog.apply(course_id, db_course, catalog_version)
+        popular_courses.apply(course_id, db_course)
     return db_course
 
 @router.delete("/{course_id}")
@@ -111,8 +461,16 @@ async def delete_course(
     if db_course.instructor_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this course")
 
+    catalog_version = bump_catalog_version(db) if db_course.status == CourseStatus.PUBLISHED else None
+    text_content_ids = [text_content.id for text_content in db_course.text_contents]
     db.delete(db_course)
     db.commit()
+    invalidate_counts("courses", "text_contents")
+    invalidate_instructor_dashboard(current_user.id)
+    remove_course(course_id, text_content_ids)
+    if catalog_version is not None:
+        published_catalog.apply(course_id, None, catalog_version)
+        popular_courses.apply(course_id, None)
     return {"message": "Course deleted successfully"}
 
 @router.put("/{course_id}/publish", response_model=CourseSchema)
@@ -138,9 +496,14 @@ async def publish_course(
         # Toggle between PUBLISHED and DRAFT
         new_status = CourseStatus.DRAFT if db_course.status == CourseStatus.PUBLISHED else CourseStatus.PUBLISHED
         db_course.status = new_status
+        catalog_version = bump_catalog_version(db)
         
         db.commit()
         db.refresh(db_course)
+        invalidate_counts("courses")
+        invalidate_instructor_dashboard(current_user.id)
+        published_catalog.apply(course_id, db_course, catalog_version)
+        popular_courses.apply(course_id, db_course)
         
         action = "published" if new_status == CourseStatus.PUBLISHED else "unpublished"
         logger.info(f"Course {db_course.title} (ID: {course_id}) {action} by user {current_user.username}")
@@ -155,41 +518,6 @@ async def publish_course(
             detail="Error updating course status"
         )
 
-@router.get("/published", response_model=PaginatedCourseResponse)
-async def get_published_courses(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
-    db: Session = Depends(get_db)
-):
-    """
-    Get all published courses with pagination.
-    """
-    try:
-        # Get total count of published courses
-        total_courses = db.query(func.count(Course.id)).filter(
-            Course.status == CourseStatus.PUBLISHED
-        ).scalar()
-        
-        # Get published courses with pagination
-        courses = db.query(Course).filter(
-            Course.status == CourseStatus.PUBLISHED
-        ).offset(skip).limit(limit).all()
-        
-        logger.info(f"Retrieved {len(courses)} published courses out of {total_courses} total published courses")
-        
-        return PaginatedCourseResponse(
-            total=total_courses,
-            skip=skip,
-            limit=limit,
-            courses=courses
-        )
-    except Exception as e:
-        logger.error(f"Error fetching published courses: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error fetching published courses"
-        )
-
 # # Lesson endpoints
 # @router.post("/{course_id}/lessons", response_model=LessonSchema)
 # async def create_lesson(
@@ -1,54 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from models.models import User, Course
-from models.schemas import Enrollment as EnrollmentSchema, EnrollmentCreate
-from utils.auth import get_current_active_user
-from database.database import get_db
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from models.models import User, Course, Enrollment, EnrollmentStatus
+from models.schemas import Enrollment as EnrollmentSchema, EnrollmentCreate, BulkEnrollmentCreate, BulkEnrollmentResult, ProgressReport, PaginatedEnrollmentResponse
+from utils.auth import get_current_active_user, get_current_admin_user
+from database.database import get_db, get_async_db, get_async_primary_read_db
+from utils.logger import logger
+from utils.progress_buffer import progress_buffer
+from utils.enrollment_cache import my_enrollments_cache, invalidate_my_enrollments
+from utils.pagination import keyset_page
+from utils.course_counters import adjust_course_counters, popular_courses
+from utils.dashboards import invalidate_instructor_dashboard
+from utils.activity import record_activity
 
 router = APIRouter(
     prefix="/enrollments",
     tags=["enrollments"]
 )
 
+def _course_instructor_id(db: Session, course_id: int):
+    return db.query(Course.instructor_id).filter(Course.id == course_id).scalar()
+
 @router.post("/", response_model=EnrollmentSchema)
 async def create_enrollment(
     enrollment: EnrollmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     # Check if course exists
-    course = db.query(Course).filter(Course.id == enrollment.course_id).first()
-    if course is None:
+    instructor_id = (await db.execute(
+        select(Course.instructor_id).where(Course.id == enrollment.course_id)
+    )).first()
+    if instructor_id is None:
         raise HTTPException(status_code=404, detail="Course not found")
 
-    # Check if already enrolled
-    existing_enrollment = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id,
-        Enrollment.course_id == enrollment.course_id
-    ).first()
-    if existing_enrollment:
-        raise HTTPException(status_code=400, detail="Already enrolled in this course")
-
-    # Create enrollment
+    # Create enrollment; the unique (user_id, course_id) index rejects duplicates
     db_enrollment = Enrollment(
         user_id=current_user.id,
         course_id=enrollment.course_id
     )
     db.add(db_enrollment)
-    db.commit()
-    db.refresh(db_enrollment)
+    await db.run_sync(adjust_course_counters, enrollment.course_id, enrolled=1)
+    await db.run_sync(record_activity, enrollments=1)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Already enrolled in this course")
+    await db.refresh(db_enrollment)
+    popular_courses.adjust(enrollment.course_id, enrolled=1)
+    invalidate_instructor_dashboard(instructor_id[0])
+    invalidate_my_enrollments(current_user.id)
     return db_enrollment
 
-@router.get("/my-enrollments", response_model=List[EnrollmentSchema])
-async def read_my_enrollments(
+@router.post("/bulk", response_model=BulkEnrollmentResult)
+async def create_bulk_enrollment(
+    cohort: BulkEnrollmentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    enrollments = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id
-    ).all()
-    return enrollments
+    course = db.query(Course).filter(Course.id == cohort.course_id).first()
+    if course is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    if course.instructor_id != current_user.id and not current_user.is_admin():
+        raise HTTPException(status_code=403, detail="Not authorized to enroll users in this course")
+
+    requested_ids = list(dict.fromkeys(cohort.user_ids))
+    known_ids = {
+        user_id for (user_id,) in db.query(User.id).filter(User.id.in_(requested_ids))
+    }
+    user_ids = [user_id for user_id in requested_ids if user_id in known_ids]
+
+    enrolled = 0
+    if user_ids:
+        # One multi-row insert; rows that hit the unique index are skipped
+        statement = insert(Enrollment).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+        result = db.execute(statement.values([
+            {"user_id": user_id, "course_id": cohort.course_id} for user_id in user_ids
+        ]))
+        enrolled = result.rowcount
+        adjust_course_counters(db, cohort.course_id, enrolled=enrolled)
+        record_activity(db, enrollments=enrolled)
+        db.commit()
+        popular_courses.adjust(cohort.course_id, enrolled=enrolled)
+        invalidate_instructor_dashboard(course.instructor_id)
+        invalidate_my_enrollments(*user_ids)
+
+    logger.info(f"Bulk enrollment into course {cohort.course_id} by {current_user.username}: {enrolled} of {len(requested_ids)} users enrolled")
+    return BulkEnrollmentResult(
+        course_id=cohort.course_id,
+        requested=len(requested_ids),
+        enrolled=enrolled,
+        already_enrolled=len(user_ids) - enrolled,
+        unknown_user_ids=[user_id for user_id in requested_ids if user_id not in known_ids]
+    )
+
+@router.post("/progress", status_code=202)
+async def report_progress(
+    report: ProgressReport,
+    current_user: User = Depends(get_current_active_user)
+):
+    # Buffered and written in batches; reports for courses the user isn't enrolled in update nothing
+    progress_buffer.record(current_user.id, report.course_id, report.progress)
+    return {"message": "Progress recorded"}
+
+@router.get("/progress/metrics")
+async def read_progress_metrics(current_user: User = Depends(get_current_admin_user)):
+    return progress_buffer.stats()
+
+@router.get("/my-enrollments", response_model=PaginatedEnrollmentResponse)
+async def read_my_enrollments(
+    limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    enrollment_status: Optional[EnrollmentStatus] = Query(None, alias="status", description="Filter by enrollment status"),
+    # Cached pages are refilled from the primary: cohort enrollments invalidate
+    # them for users whose own reads would otherwise go to a replica
+    db: AsyncSession = Depends(get_async_primary_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    cache_key = (current_user.id, enrollment_status, cursor, limit)
+    cached = my_enrollments_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    def enrollment_page(session: Session):
+        # Course fields are joined in, so clients don't fetch each course separately
+        query = session.query(
+            Enrollment.id,
+            Enrollment.course_id,
+            Enrollment.status,
+            Enrollment.completed,
+            Enrollment.created_at,
+            Course.title.label("course_title"),
+            Course.level.label("course_level"),
+            Course.status.label("course_status")
+        ).join(Course, Course.id == Enrollment.course_id).filter(
+            Enrollment.user_id == current_user.id
+        )
+        if enrollment_status is not None:
+            query = query.filter(Enrollment.status == enrollment_status)
+        return keyset_page(query, (Enrollment.id,), limit, cursor)
+
+    enrollments, next_cursor = await db.run_sync(enrollment_page)
+    response = PaginatedEnrollmentResponse(
+        limit=limit,
+        enrollments=enrollments,
+        next_cursor=next_cursor
+    )
+    my_enrollments_cache.set(cache_key, response)
+    return response
 
 @router.put("/{enrollment_id}/complete")
 async def mark_course_completed(
@@ -63,8 +166,20 @@ async def mark_course_completed(
     if enrollment is None:
         raise HTTPException(status_code=404, detail="Enrollment not found")
 
-    enrollment.completed = True
+    # Conditional on completed being false, so of two overlapping requests only
+    # the one that flips it counts the completion
+    first_completion = db.query(Enrollment).filter(
+        Enrollment.id == enrollment.id,
+        Enrollment.completed == False
+    ).update({Enrollment.completed: True}, synchronize_session=False) == 1
+    if first_completion:
+        adjust_course_counters(db, enrollment.course_id, completed=1)
+        record_activity(db, completions=1)
     db.commit()
+    if first_completion:
+        popular_courses.adjust(enrollment.course_id, completed=1)
+    invalidate_instructor_dashboard(_course_instructor_id(db, enrollment.course_id))
+    invalidate_my_enrollments(current_user.id)
     return {"message": "Course marked as completed"}
 
 @router.delete("/{enrollment_id}")
@@ -80,6 +195,12 @@ async def delete_enrollment(
     if enrollment is None:
         raise HTTPException(status_code=404, detail="Enrollment not found")
 
+    course_id = enrollment.course_id
+    completed = 1 if enrollment.completed else 0
     db.delete(enrollment)
+    adjust_course_counters(db, course_id, enrolled=-1, completed=-completed)
     db.commit()
+    popular_courses.adjust(course_id, enrolled=-1, completed=-completed)
+    invalidate_instructor_dashboard(_course_instructor_id(db, course_id))
+    invalidate_my_enrollments(current_user.id)
     return {"message": "Enrollment deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from models.models import User, Course, Enrollment
+from schemas.schemas import InstructorDashboard
+from utils.auth import get_current_active_user
+from utils.dashboards import dashboard_cache
+from database.database import get_primary_read_db
+from utils.logger import logger
+
+router = APIRouter(
+    prefix="/instructors",
+    tags=["instructors"]
+)
+
+def _rate(completed: int, total: int) -> float:
+    return round(completed / total, 4) if total else 0.0
+
+def build_instructor_dashboard(db: Session, instructor_id: int) -> InstructorDashboard:
+    """
+    Per-course enrollment totals, completion rates and status breakdowns from
+    a single GROUP BY over courses left-joined to enrollments.
+    """
+    rows = db.query(
+        Course.id,
+        Course.title,
+        Course.status,
+        Enrollment.status,
+        func.count(Enrollment.id),
+        func.sum(case((Enrollment.completed == True, 1), else_=0))
+    ).outerjoin(
+        Enrollment, Enrollment.course_id == Course.id
+    ).filter(
+        Course.instructor_id == instructor_id
+    ).group_by(
+        Course.id, Course.title, Course.status, Enrollment.status
+    ).order_by(Course.id).all()
+
+    courses = {}
+    for course_id, title, course_status, enrollment_status, enrollments, completed in rows:
+        stats = courses.setdefault(course_id, {
+            "course_id": course_id,
+            "title": title,
+            "status": course_status,
+            "enrollments": 0,
+            "completed": 0,
+            "enrollment_status": {},
+        })
+        # Courses without enrollments come back as a single row with a NULL status
+        if enrollment_status is not None:
+            stats["enrollment_status"][enrollment_status.value] = enrollments
+        stats["enrollments"] += enrollments
+        stats["completed"] += completed or 0
+
+    course_status_counts = {}
+    for stats in courses.values():
+        stats["completion_rate"] = _rate(stats["completed"], stats["enrollments"])
+        if stats["status"] is not None:
+            key = stats["status"].value
+            course_status_counts[key] = course_status_counts.get(key, 0) + 1
+
+    total_enrollments = sum(stats["enrollments"] for stats in courses.values())
+    total_completed = sum(stats["completed"] for stats in courses.values())
+    return InstructorDashboard(
+        instructor_id=instructor_id,
+        total_courses=len(courses),
+        total_enrollments=total_enrollments,
+        total_completed=total_completed,
+        completion_rate=_rate(total_completed, total_enrollments),
+        course_status=course_status_counts,
+        courses=list(courses.values())
+    )
+
+@router.get("/me/dashboard", response_model=InstructorDashboard)
+async def read_my_dashboard(
+    db: Session = Depends(get_primary_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    dashboard = dashboard_cache.get(current_user.id)
+    if dashboard is None:
+        dashboard = build_instructor_dashboard(db, current_user.id)
+        dashboard_cache.set(current_user.id, dashboard)
+        logger.info(f"Built dashboard for instructor {current_user.username}: {dashboard.total_courses} courses")
+    return dashboard
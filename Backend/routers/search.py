@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from database.database import get_async_primary_read_db
+from schemas.schemas import SearchResponse
+from utils.search_index import search_index, search_index_sync, COURSE_DOC, TEXT_CONTENT_DOC
+from utils.logger import logger
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    type: Optional[str] = Query(None, pattern=f"^({COURSE_DOC}|{TEXT_CONTENT_DOC})$", description="Restrict to course or text_content"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
+    db: AsyncSession = Depends(get_async_primary_read_db)
+):
+    """
+    Search course titles, descriptions, categories and text content.
+    Results are ranked with BM25 over the in-memory inverted index, which
+    picks up other workers' writes every SEARCH_SYNC_SECONDS.
+    """
+    await db.run_sync(search_index_sync.ensure_fresh)
+    total, hits = search_index.search(q, limit=limit, skip=skip, doc_type=type)
+    logger.info(f"Search for '{q}' matched {total} documents")
+    return SearchResponse(
+        query=q,
+        total=total,
+        skip=skip,
+        limit=limit,
+        results=hits
+    )
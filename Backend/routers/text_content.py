@@ -1,90 +1,297 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from database.database import get_db
-from models.models import TextContent, Course
-from schemas.schemas import TextContentCreate, TextContentOut
-from typing import List
+from sqlalchemy.exc import IntegrityError, OperationalError
+from database.database import get_db, get_read_db, get_primary_read_db
+from models.models import TextContent, TextContentVersion, Course, User
+from schemas.schemas import (
+    TextContentCreate,
+    TextContentOut,
+    TextContentVersionList,
+    TextContentVersionOut,
+    BulkTextContentUpsert,
+    BulkTextContentResult
+)
+from utils.auth import get_current_active_user
+from utils.logger import logger
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel
+from utils.pagination import paginate, keyset_page, OFFSET_MODE, PAGINATION_MODE_PATTERN
+from utils.counts import resolve_total, invalidate_counts, COUNT_EXACT, COUNT_MODE_PATTERN
+from utils.etag import make_etag, etag_matches, not_modified
+from utils.search_index import index_text_content
+from utils.text_versions import record_versions, load_version, text_content_state
+from utils.upsert import upsert_statement
+from utils.rendering import render_formatted_text, render_formatted_text_async
+from utils.fields import parse_fields, sparse_query, sparse_rows, FIELDS_DESCRIPTION
+
+class RenderRequest(BaseModel):
+    raw_text: str
+    formatting_options: Optional[Dict[str, Any]] = None
+
+class RenderResponse(BaseModel):
+    formatted_text: str
 
 class PaginatedTextContentResponse(BaseModel):
-    total: int
+    total: Optional[int]
     skip: int
     limit: int
-    text_contents: List[TextContentOut]
+    # Rows are partial dicts when the request names `fields`
+    text_contents: List[Union[TextContentOut, Dict[str, Any]]]
+    next_cursor: Optional[str] = None
 
 router = APIRouter(
     prefix="/text-contents",
     tags=["text-contents"]
 )
 
+# Columns every page selects for its ETag, whatever `fields` asks for
+ETAG_FIELDS = ("id", "version", "updated_at")
+
+def _page_etag(total, next_cursor, rows, fields=None):
+    return make_etag("text_contents", total, next_cursor, fields, [(row.id, row.version, row.updated_at) for row in rows])
+
+def _merge_text_content(proposed, greatest):
+    # SET clause for a save that hits an existing row; every write gets a new version
+    table = TextContent.__table__
+    return {
+        "raw_text": proposed.raw_text,
+        "formatted_text": proposed.formatted_text,
+        "formatting_options": proposed.formatting_options,
+        "version": greatest(proposed.version, table.c.version + 1),
+        "published": table.c.published | proposed.published,
+        "updated_at": func.now(),
+    }
+
+def _save_text_contents(db: Session, items: List[TextContentCreate]) -> dict:
+    """
+    Save the text contents of several courses with a single upsert statement.
+    The unique course_id index turns a concurrent first save of the same
+    course into an update instead of a duplicate row. Leaves the transaction
+    open for the caller to commit.
+    """
+    payloads = {item.course_id: item for item in items}
+    course_ids = list(payloads)
+
+    # Lock the rows being replaced so their history deltas stay consistent.
+    # They are locked by primary key: a locking read of a course_id with no
+    # row yet would take a gap lock on the unique index, and two first saves
+    # holding that gap deadlock as soon as both insert into it
+    existing_ids = [text_content_id for (text_content_id,) in db.query(TextContent.id).filter(TextContent.course_id.in_(course_ids))]
+    existing = {
+        tc.course_id: tc
+        for tc in db.query(TextContent).filter(TextContent.id.in_(existing_ids)).with_for_update()
+    } if existing_ids else {}
+    new_ids = [course_id for course_id in course_ids if course_id not in existing]
+    known_ids = {course_id for (course_id,) in db.query(Course.id).filter(Course.id.in_(new_ids))} if new_ids else set()
+
+    rows, previous, unchanged = [], {}, []
+    for course_id, item in payloads.items():
+        current = existing.get(course_id)
+        if current is None and course_id not in known_ids:
+            continue
+
+        # formatted_text is rendered here rather than taken from the client; a
+        # re-save of unchanged content is answered from the render cache
+        formatted_text = render_formatted_text(item.raw_text, item.formatting_options)
+        if current is not None:
+            if (
+                current.raw_text == item.raw_text
+                and current.formatted_text == formatted_text
+                and current.formatting_options == item.formatting_options
+                and current.published == (item.published or current.published)
+                and (item.version or 0) <= current.version
+            ):
+                unchanged.append(current)
+                continue
+            previous[course_id] = text_content_state(current)
+
+        rows.append({
+            "course_id": course_id,
+            "raw_text": item.raw_text,
+            "formatted_text": formatted_text,
+            "formatting_options": item.formatting_options,
+            "version": item.version or 1,
+            "published": item.published or False,
+        })
+
+    saved = []
+    if rows:
+        # A row another save created since the read above is merged by the
+        # upsert; with no previous state, its history gets a full snapshot
+        try:
+            db.execute(upsert_statement(db, TextContent.__table__, rows, ("course_id",), _merge_text_content))
+        except OperationalError as e:
+            _raise_conflict(db, e)
+        saved = db.query(TextContent).filter(
+            TextContent.course_id.in_([row["course_id"] for row in rows])
+        ).populate_existing().all()
+        record_versions(db, [(tc, previous.get(tc.course_id)) for tc in saved])
+
+    return {
+        "saved": saved,
+        "unchanged": unchanged,
+        "created": len(rows) - len(previous),
+        "unknown_course_ids": [course_id for course_id in new_ids if course_id not in known_ids],
+    }
+
+# MySQL deadlock and lock wait timeout
+RETRYABLE_ERROR_CODES = (1213, 1205)
+
+def _raise_conflict(db: Session, error: Exception):
+    # Constraint violations and lock conflicts with a concurrent save become
+    # a 409 the client can retry; any other database error propagates
+    if isinstance(error, OperationalError):
+        args = getattr(error.orig, "args", ())
+        if not args or args[0] not in RETRYABLE_ERROR_CODES:
+            raise error
+    db.rollback()
+    raise HTTPException(status_code=409, detail="Text content was modified concurrently, please retry")
+
+def _commit_saved(db: Session, saved: List[TextContentOut], created: int):
+    try:
+        db.commit()
+    except (IntegrityError, OperationalError) as e:
+        _raise_conflict(db, e)
+    if created:
+        invalidate_counts("text_contents")
+    for text_content in saved:
+        index_text_content(text_content)
+
 @router.post("/", response_model=TextContentOut, status_code=status.HTTP_201_CREATED)
 def create_text_content(
     text_content: TextContentCreate,
     db: Session = Depends(get_db)
 ):
-    # Check if the course exists
-    course = db.query(Course).filter(Course.id == text_content.course_id).first()
-    if not course:
+    result = _save_text_contents(db, [text_content])
+    if result["unknown_course_ids"]:
         raise HTTPException(status_code=404, detail="Course not found")
+    if result["unchanged"]:
+        return result["unchanged"][0]
 
-    # Check if a TextContent record already exists for this course_id
-    existing_text_content = db.query(TextContent).filter(TextContent.course_id == text_content.course_id).first()
+    # Serialized before the commit expires it, which saves a refresh
+    saved = TextContentOut.model_validate(result["saved"][0], from_attributes=True)
+    _commit_saved(db, [saved], result["created"])
+    return saved
 
-    if existing_text_content:
-        # Update existing record
-        existing_text_content.raw_text = text_content.raw_text
-        existing_text_content.formatted_text = text_content.formatted_text
-        existing_text_content.formatting_options = text_content.formatting_options
-        existing_text_content.version = text_content.version or existing_text_content.version
-        existing_text_content.published = text_content.published or existing_text_content.published
-        db.commit()
-        db.refresh(existing_text_content)
-        return existing_text_content
-    else:
-        # Create new record
-        db_text_content = TextContent(
-            course_id=text_content.course_id,
-            raw_text=text_content.raw_text,
-            formatted_text=text_content.formatted_text,
-            formatting_options=text_content.formatting_options,
-            version=text_content.version or 1,
-            published=text_content.published or False
-        )
-        db.add(db_text_content)
-        db.commit()
-        db.refresh(db_text_content)
-        return db_text_content
+@router.post("/bulk", response_model=BulkTextContentResult)
+def bulk_upsert_text_contents(
+    bulk: BulkTextContentUpsert,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create or replace the text content of many courses in one statement.
+    When a course appears more than once, its last item wins.
+    """
+    result = _save_text_contents(db, bulk.items)
+    saved = [TextContentOut.model_validate(tc, from_attributes=True) for tc in result["saved"]]
+    _commit_saved(db, saved, result["created"])
+
+    logger.info(f"Bulk text content upsert by {current_user.username}: {len(saved)} saved, {len(result['unchanged'])} unchanged")
+    return BulkTextContentResult(
+        requested=len(bulk.items),
+        created=result["created"],
+        updated=len(saved) - result["created"],
+        unchanged=len(result["unchanged"]),
+        unknown_course_ids=result["unknown_course_ids"]
+    )
+
+@router.post("/render", response_model=RenderResponse)
+async def render_text_content(request: RenderRequest):
+    # Preview of the formatted_text a save would store
+    formatted_text = await render_formatted_text_async(request.raw_text, request.formatting_options)
+    return RenderResponse(formatted_text=formatted_text)
 
 @router.get("/", response_model=PaginatedTextContentResponse)
 def get_all_text_contents(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page; implies cursor pagination"),
+    pagination: str = Query(OFFSET_MODE, pattern=PAGINATION_MODE_PATTERN, description="offset or cursor"),
+    count: str = Query(COUNT_EXACT, pattern=COUNT_MODE_PATTERN, description="exact, estimate or none"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    primary_db: Session = Depends(get_primary_read_db)
 ):
-    # Get total count
-    total_text_contents = db.query(TextContent).count()
+    # Unrequested columns are left out of the SELECT, so summary listings never read the text bodies
+    selected_fields = parse_fields(fields, list(TextContentOut.model_fields))
+
+    # Get total count; cached, so read from the primary
+    total_text_contents = resolve_total(primary_db, count, "text_contents", lambda: primary_db.query(TextContent).count())
     
     # Get text contents with pagination
-    text_contents = db.query(TextContent).offset(skip).limit(limit).all()
+    if if_none_match:
+        # Revalidate from (id, version, updated_at) so a 304 never reads the text columns
+        page, next_cursor = paginate(
+            sparse_query(db, TextContent, ETAG_FIELDS),
+            (TextContent.id,), skip, limit, cursor, pagination
+        )
+        etag = _page_etag(total_text_contents, next_cursor, page, selected_fields)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        ids = [row.id for row in page]
+        query = sparse_query(db, TextContent, selected_fields) if selected_fields else db.query(TextContent)
+        rows_by_id = {tc.id: tc for tc in query.filter(TextContent.id.in_(ids)).all()}
+        text_contents = [rows_by_id[i] for i in ids if i in rows_by_id]
+    else:
+        query = sparse_query(db, TextContent, selected_fields, ETAG_FIELDS) if selected_fields else db.query(TextContent)
+        text_contents, next_cursor = paginate(
+            query, (TextContent.id,), skip, limit, cursor, pagination
+        )
+        etag = _page_etag(total_text_contents, next_cursor, text_contents, selected_fields)
+    response.headers["ETag"] = etag
     
-    # Convert SQLAlchemy models to dictionaries and then to Pydantic models
-    text_content_out_list = [
-        TextContentOut(
-            id=tc.id,
-            course_id=tc.course_id,
-            raw_text=tc.raw_text,
-            formatted_text=tc.formatted_text,
-            formatting_options=tc.formatting_options,
-            version=tc.version,
-            published=tc.published,
-            created_at=tc.created_at,
-            updated_at=tc.updated_at
-        ) for tc in text_contents
-    ]
+    if selected_fields:
+        text_content_out_list = sparse_rows(text_contents, selected_fields)
+    else:
+        text_content_out_list = [TextContentOut.model_validate(tc, from_attributes=True) for tc in text_contents]
     
     return PaginatedTextContentResponse(
         total=total_text_contents,
         skip=skip,
         limit=limit,
-        text_contents=text_content_out_list
-    ) 
\ No newline at end of file
+        text_contents=text_content_out_list,
+        next_cursor=next_cursor
+    )
+
+@router.get("/{text_content_id}/versions", response_model=TextContentVersionList)
+def list_text_content_versions(
+    text_content_id: int,
+    limit: int = Query(20, ge=1, le=100, description="Number of versions to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    db: Session = Depends(get_read_db)
+):
+    if db.query(TextContent.id).filter(TextContent.id == text_content_id).first() is None:
+        raise HTTPException(status_code=404, detail="Text content not found")
+
+    stored_size = func.coalesce(func.length(TextContentVersion.raw_text), 0) + func.coalesce(func.length(TextContentVersion.formatted_text), 0)
+    query = db.query(
+        TextContentVersion.version,
+        TextContentVersion.is_snapshot,
+        stored_size.label("stored_size"),
+        TextContentVersion.created_at
+    ).filter(TextContentVersion.text_content_id == text_content_id)
+    versions, next_cursor = keyset_page(query, (TextContentVersion.version,), limit, cursor)
+
+    return TextContentVersionList(
+        text_content_id=text_content_id,
+        limit=limit,
+        versions=versions,
+        next_cursor=next_cursor
+    )
+
+@router.get("/{text_content_id}/versions/{version}", response_model=TextContentVersionOut)
+def get_text_content_version(
+    text_content_id: int,
+    version: int,
+    db: Session = Depends(get_read_db)
+):
+    # Rebuilt from the nearest snapshot plus the deltas after it
+    text_content_version = load_version(db, text_content_id, version)
+    if text_content_version is None:
+        raise HTTPException(status_code=404, detail="Text content version not found")
+    return text_content_version
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, validator, ConfigDict
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from models.models import UserRole, CourseLevel, CourseStatus
+from typing import Optional, List, Dict, Any, Union
+from datetime import date, datetime
+from models.models import UserRole, CourseLevel, CourseStatus, ContentType
 
 class TokenData(BaseModel):
     username: Optional[str] = None
@@ -71,13 +71,25 @@ class Course(CourseBase):
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedCourseResponse(BaseModel):
-    total: int
+    total: Optional[int]
     skip: int
     limit: int
-    courses: List[Course]
+    # Rows are partial dicts when the request names `fields`
+    courses: List[Union[Course, Dict[str, Any]]]
+    next_cursor: Optional[str] = None
+    facets: Optional[Dict[str, Dict[str, int]]] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+class CourseImportError(BaseModel):
+    line: int
+    error: str
+
+class CourseImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[CourseImportError]
+
 # Lesson Schemas
 class LessonBase(BaseModel):
     title: str
@@ -110,10 +122,54 @@ class PaginatedLessonResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class InstructorCourseStats(BaseModel):
+    course_id: int
+    title: str
+    status: Optional[CourseStatus] = None
+    enrollments: int
+    completed: int
+    completion_rate: float
+    enrollment_status: Dict[str, int]
+
+class InstructorDashboard(BaseModel):
+    instructor_id: int
+    total_courses: int
+    total_enrollments: int
+    total_completed: int
+    completion_rate: float
+    course_status: Dict[str, int]
+    courses: List[InstructorCourseStats]
+
+class PopularCourse(BaseModel):
+    course_id: int
+    title: str
+    category: str
+    level: CourseLevel
+    enrollment_count: int
+    completion_count: int
+
+class PopularCoursesResponse(BaseModel):
+    limit: int
+    courses: List[PopularCourse]
+
+class SearchHit(BaseModel):
+    type: str
+    id: int
+    course_id: int
+    title: Optional[str] = None
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    skip: int
+    limit: int
+    results: List[SearchHit]
+
 class TextContentCreate(BaseModel):
     course_id: int
     raw_text: str
-    formatted_text: Optional[str] = None
+    formatted_text: Optional[str] = None  # Ignored; rendered server-side from raw_text and formatting_options
     formatting_options: Optional[Dict[str, Any]] = None  # e.g., {"font_size": 16, "font_family": "Arial"}
     version: Optional[int] = 1
     published: Optional[bool] = False
@@ -136,4 +192,72 @@ class TextContentOut(BaseModel):
         return v
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class BulkTextContentUpsert(BaseModel):
+    items: List[TextContentCreate] = Field(..., min_length=1, max_length=500)
+
+class BulkTextContentResult(BaseModel):
+    requested: int
+    created: int
+    updated: int
+    unchanged: int
+    unknown_course_ids: List[int]
+
+class TextContentVersionSummary(BaseModel):
+    version: int
+    is_snapshot: bool
+    stored_size: int
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TextContentVersionList(BaseModel):
+    text_content_id: int
+    limit: int
+    versions: List[TextContentVersionSummary]
+    next_cursor: Optional[str] = None
+
+class TextContentVersionOut(BaseModel):
+    text_content_id: int
+    version: int
+    raw_text: Optional[str] = None
+    formatted_text: Optional[str] = None
+    formatting_options: Optional[Dict[str, Any]] = None
+    published: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+class DailyActivityOut(BaseModel):
+    day: date
+    signups: int
+    active_users: int
+    logins: int
+    enrollments: int
+    completions: int
+
+class ActivitySeriesResponse(BaseModel):
+    start: date
+    end: date
+    days: List[DailyActivityOut]
+
+class InstructorSummary(BaseModel):
+    id: int
+    username: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ContentOutlineItem(BaseModel):
+    id: int
+    title: str
+    content_type: ContentType
+    order: int
+    duration_minutes: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CourseOverview(BaseModel):
+    course: Course
+    instructor: InstructorSummary
+    text_contents: List[TextContentOut]
+    enrollment_count: int
+    outline: List[ContentOutlineItem]
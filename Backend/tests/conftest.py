@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from database.database import (
+    Base, get_db, get_read_db, get_primary_read_db, get_async_db, get_async_read_db, get_async_primary_read_db
+)
+from routers import auth, courses, enrollments, text_content
+
+class AppUnderTest:
+    """The app under test and both engines on one throwaway SQLite file."""
+
+    def __init__(self, app, engine, async_engine, SessionLocal):
+        self.app = app
+        self.engine = engine
+        self.async_engine = async_engine
+        self.SessionLocal = SessionLocal
+        self.client = TestClient(app)
+
+@pytest.fixture
+def test_db(tmp_path):
+    database_file = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{database_file}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_file}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_test_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_test_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(courses.router)
+    app.include_router(enrollments.router)
+    app.include_router(text_content.router)
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
+    app.dependency_overrides[get_primary_read_db] = get_test_db
+    app.dependency_overrides[get_async_db] = get_test_async_db
+    app.dependency_overrides[get_async_read_db] = get_test_async_db
+    app.dependency_overrides[get_async_primary_read_db] = get_test_async_db
+
+    yield AppUnderTest(app, engine, async_engine, SessionLocal)
+    engine.dispose()
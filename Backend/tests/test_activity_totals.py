@@ -0,0 +1,39 @@
+from models.models import ActivityTotal, User
+from utils.activity import adjust_totals, user_statistics
+
+def add_existing_users(db, count: int, active: bool = True):
+    # Rows from before the rollup: nothing recorded them in the totals
+    db.add_all([
+        User(username=f"existing{i}-{active}", email=f"existing{i}-{active}@example.com", hashed_password="x", is_active=active)
+        for i in range(count)
+    ])
+    db.commit()
+
+def test_first_write_before_seeding_stores_the_live_totals(test_db):
+    db = test_db.SessionLocal()
+    add_existing_users(db, 3)
+    add_existing_users(db, 2, active=False)
+
+    response = test_db.client.post("/auth/register", json={
+        "username": "newcomer", "email": "newcomer@example.com",
+        "password": "password123", "password_confirm": "password123"
+    })
+    assert response.status_code == 200
+
+    statistics = user_statistics(db)
+    assert (statistics["total_users"], statistics["active_users"]) == (6, 4)
+    db.close()
+
+def test_seeded_totals_get_the_delta(test_db):
+    db = test_db.SessionLocal()
+    add_existing_users(db, 3)
+    db.add_all([ActivityTotal(name="total_users", value=10), ActivityTotal(name="active_users", value=10)])
+    db.commit()
+
+    db.add(User(username="another", email="another@example.com", hashed_password="x", is_active=True))
+    adjust_totals(db, total_users=1, active_users=1)
+    db.commit()
+
+    statistics = user_statistics(db)
+    assert (statistics["total_users"], statistics["active_users"]) == (11, 11)
+    db.close()
@@ -0,0 +1,34 @@
+from datetime import datetime
+from models.models import Course, CourseLevel, User
+
+def test_edits_within_one_second_change_the_etag(test_db):
+    db = test_db.SessionLocal()
+    instructor = User(username="instructor", email="instructor@example.com", hashed_password="x")
+    db.add(instructor)
+    db.flush()
+    same_second = datetime(2026, 1, 1, 12, 0, 0)
+    course = Course(
+        title="First title", description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+        category="test", instructor_id=instructor.id, updated_at=same_second
+    )
+    db.add(course)
+    db.commit()
+
+    first = test_db.client.get(f"/courses/{course.id}")
+    etag = first.headers["ETag"]
+    assert test_db.client.get(f"/courses/{course.id}", headers={"If-None-Match": etag}).status_code == 304
+
+    # A second edit that lands in the same second as the first
+    course.title = "Second title"
+    course.updated_at = same_second
+    db.commit()
+
+    second = test_db.client.get(f"/courses/{course.id}", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.json()["title"] == "Second title"
+    assert second.headers["ETag"] != etag
+    db.close()
+
+def test_missing_course_is_404_with_or_without_if_none_match(test_db):
+    assert test_db.client.get("/courses/999").status_code == 404
+    assert test_db.client.get("/courses/999", headers={"If-None-Match": '"abc"'}).status_code == 404
@@ -0,0 +1,40 @@
+import asyncio
+import json
+from sqlalchemy import event
+from utils.search_index import search_index
+
+def auth_headers(client) -> dict:
+    client.post("/auth/register", json={
+        "username": "importer", "email": "importer@example.com",
+        "password": "password123", "password_confirm": "password123"
+    })
+    token = client.post("/auth/login", json={"email": "importer@example.com", "password": "password123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def test_import_runs_its_statements_off_the_event_loop(test_db):
+    headers = auth_headers(test_db.client)
+    course = {"title": "Imported quasar", "description": "d", "duration_weeks": 2, "level": "BEGINNER", "category": "c"}
+    body = "\n".join([json.dumps(course), "not json", json.dumps({**course, "title": "Imported pulsar"})])
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(on_event_loop())
+    event.listen(test_db.engine, "before_cursor_execute", listener)
+    try:
+        response = test_db.client.post(
+            "/courses/import", content=body, headers={**headers, "Content-Type": "application/x-ndjson"}
+        )
+    finally:
+        event.remove(test_db.engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    assert response.json()["errors"][0]["line"] == 2
+    assert statements and not any(statements)
+    assert search_index.search("quasar")[0] == 1
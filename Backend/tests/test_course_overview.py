@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event
+from models.models import (
+    ContentType, Course, CourseContent, CourseLevel, CourseStatus, Enrollment, TextContent, User
+)
+
+# Course with its instructor and enrollment count, published text contents,
+# published outline
+OVERVIEW_STATEMENTS = 3
+
+def seed_course(db, contents: int, enrollments: int) -> int:
+    instructor = User(username="instructor", email="instructor@example.com", hashed_password="x")
+    students = [
+        User(username=f"student{i}", email=f"student{i}@example.com", hashed_password="x")
+        for i in range(enrollments)
+    ]
+    db.add_all([instructor, *students])
+    db.flush()
+
+    course = Course(
+        title="Overview", description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+        category="test", status=CourseStatus.PUBLISHED, instructor_id=instructor.id
+    )
+    db.add(course)
+    db.flush()
+    db.add(TextContent(course_id=course.id, raw_text="hello", formatted_text="<p>hello</p>", published=True))
+    db.add_all([
+        CourseContent(
+            course_id=course.id, title=f"Lesson {i}", content_type=ContentType.LESSON,
+            order=contents - i, is_published=i % 3 != 0, content="body"
+        )
+        for i in range(contents)
+    ])
+    db.add_all([Enrollment(user_id=student.id, course_id=course.id) for student in students])
+    db.commit()
+    return course.id
+
+@pytest.mark.parametrize("contents, enrollments", [(0, 0), (1, 1), (10, 5), (40, 60)])
+def test_overview_runs_a_fixed_number_of_statements(test_db, contents, enrollments):
+    db = test_db.SessionLocal()
+    course_id = seed_course(db, contents, enrollments)
+    db.close()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_db.async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = test_db.client.get(f"/courses/{course_id}/overview")
+    finally:
+        event.remove(test_db.async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert len(statements) == OVERVIEW_STATEMENTS, statements
+
+    overview = response.json()
+    published = [i for i in range(contents) if i % 3 != 0]
+    assert overview["enrollment_count"] == enrollments
+    assert overview["instructor"]["username"] == "instructor"
+    assert len(overview["text_contents"]) == 1
+    assert [item["title"] for item in overview["outline"]] == [f"Lesson {i}" for i in reversed(published)]
+
+def test_overview_of_missing_course_is_404(test_db):
+    assert test_db.client.get("/courses/999/overview").status_code == 404
@@ -0,0 +1,64 @@
+from sqlalchemy import event, text
+from models.models import Course, CourseLevel, CourseStatus, DailyActivity, User
+
+def login(client, username: str) -> dict:
+    client.post("/auth/register", json={
+        "username": username, "email": f"{username}@example.com",
+        "password": "password123", "password_confirm": "password123"
+    })
+    token = client.post("/auth/login", json={"email": f"{username}@example.com", "password": "password123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def enroll(test_db) -> tuple:
+    db = test_db.SessionLocal()
+    instructor = User(username="instructor", email="instructor@example.com", hashed_password="x")
+    db.add(instructor)
+    db.flush()
+    course = Course(
+        title="Completed", description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+        category="test", status=CourseStatus.PUBLISHED, instructor_id=instructor.id
+    )
+    db.add(course)
+    db.commit()
+    course_id = course.id
+    db.close()
+
+    headers = login(test_db.client, "student")
+    enrollment_id = test_db.client.post("/enrollments/", json={"course_id": course_id}, headers=headers).json()["id"]
+    return course_id, enrollment_id, headers
+
+def completions(test_db, course_id: int) -> tuple:
+    db = test_db.SessionLocal()
+    course_count = db.query(Course.completion_count).filter(Course.id == course_id).scalar()
+    daily_count = sum(day.completions for day in db.query(DailyActivity))
+    db.close()
+    return course_count, daily_count
+
+def test_a_course_is_counted_on_its_first_completion_only(test_db):
+    course_id, enrollment_id, headers = enroll(test_db)
+
+    assert test_db.client.put(f"/enrollments/{enrollment_id}/complete", headers=headers).status_code == 200
+    assert completions(test_db, course_id) == (1, 1)
+    assert test_db.client.put(f"/enrollments/{enrollment_id}/complete", headers=headers).status_code == 200
+    assert completions(test_db, course_id) == (1, 1)
+
+def test_a_completion_that_lost_the_race_counts_nothing(test_db):
+    course_id, enrollment_id, headers = enroll(test_db)
+
+    # An overlapping request commits its completion after this one has read
+    # the enrollment as not completed, just before this one writes
+    overlapped = []
+    def overlapping_completion(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE enrollments") and not overlapped:
+            overlapped.append(statement)
+            with test_db.engine.begin() as other:
+                other.execute(text("UPDATE enrollments SET completed = 1 WHERE id = :id"), {"id": enrollment_id})
+    event.listen(test_db.engine, "before_cursor_execute", overlapping_completion)
+    try:
+        response = test_db.client.put(f"/enrollments/{enrollment_id}/complete", headers=headers)
+    finally:
+        event.remove(test_db.engine, "before_cursor_execute", overlapping_completion)
+
+    assert response.status_code == 200
+    assert overlapped
+    assert completions(test_db, course_id) == (0, 0)
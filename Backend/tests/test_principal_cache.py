@@ -0,0 +1,36 @@
+from models.models import User
+from utils import auth as auth_utils
+
+def login(client, username: str) -> dict:
+    client.post("/auth/register", json={
+        "username": username, "email": f"{username}@example.com",
+        "password": "password123", "password_confirm": "password123"
+    })
+    token = client.post("/auth/login", json={"email": f"{username}@example.com", "password": "password123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def test_deactivation_on_another_worker_applies_within_the_check_interval(test_db, monkeypatch):
+    monkeypatch.setattr(auth_utils, "PRINCIPAL_VERSION_CHECK_SECONDS", 0)
+    monkeypatch.setattr(auth_utils, "_principals_seen", {"version": 0, "checked_at": float("-inf")})
+    auth_utils.principal_cache.clear()
+    headers = login(test_db.client, "deactivated")
+    assert test_db.client.get("/auth/users/me", headers=headers).status_code == 200
+
+    # What update_user does on another worker: this worker's cache isn't touched
+    db = test_db.SessionLocal()
+    db.query(User).filter(User.username == "deactivated").update({"is_active": False})
+    auth_utils.bump_principal_version(db)
+    db.commit()
+    db.close()
+
+    assert test_db.client.get("/auth/users/me", headers=headers).status_code == 400
+
+def test_cached_principals_skip_the_user_lookup(test_db, monkeypatch):
+    monkeypatch.setattr(auth_utils, "PRINCIPAL_VERSION_CHECK_SECONDS", 3600)
+    auth_utils.principal_cache.clear()
+    headers = login(test_db.client, "cached")
+    hits = auth_utils.principal_cache.hits
+
+    test_db.client.get("/auth/users/me", headers=headers)
+    test_db.client.get("/auth/users/me", headers=headers)
+    assert auth_utils.principal_cache.hits == hits + 1
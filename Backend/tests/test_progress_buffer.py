@@ -0,0 +1,34 @@
+import asyncio
+from utils.progress_buffer import ProgressBuffer
+
+def test_size_flush_task_is_held_until_it_finishes():
+    written = []
+    buffer = ProgressBuffer(interval=3600, max_entries=2)
+    buffer._write = lambda entries: written.append(dict(entries))
+
+    async def report():
+        buffer.record(1, 1, 10.0)
+        buffer.record(1, 2, 20.0)
+        tasks = set(buffer._size_flushes)
+        assert len(tasks) == 1
+        await asyncio.gather(*tasks)
+        return tasks
+
+    tasks = asyncio.run(report())
+    assert all(task.done() for task in tasks)
+    assert not buffer._size_flushes
+    assert written == [{(1, 1): 10.0, (1, 2): 20.0}]
+    assert len(buffer) == 0
+
+def test_stop_waits_for_size_flushes_in_flight():
+    written = []
+    buffer = ProgressBuffer(interval=3600, max_entries=1)
+    buffer._write = lambda entries: written.append(dict(entries))
+
+    async def report_and_stop():
+        buffer.record(2, 1, 50.0)
+        await buffer.stop()
+
+    asyncio.run(report_and_stop())
+    assert written == [{(2, 1): 50.0}]
+    assert not buffer._size_flushes
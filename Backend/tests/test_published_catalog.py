@@ -0,0 +1,47 @@
+from models.models import CatalogVersion, Course, CourseLevel, CourseStatus, User
+from utils.catalog import PublishedCatalog, PUBLISHED_CATALOG
+
+def seed_published(db, titles, version):
+    instructor = db.query(User).first()
+    if instructor is None:
+        instructor = User(username="instructor", email="instructor@example.com", hashed_password="x")
+        db.add(instructor)
+        db.flush()
+    db.add_all([
+        Course(
+            title=title, description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+            category="test", status=CourseStatus.PUBLISHED, instructor_id=instructor.id
+        )
+        for title in titles
+    ])
+    db.merge(CatalogVersion(name=PUBLISHED_CATALOG, version=version))
+    db.commit()
+
+def test_an_older_shared_version_does_not_roll_the_snapshot_back(test_db):
+    db = test_db.SessionLocal()
+    seed_published(db, ["first", "second"], version=2)
+    catalog = PublishedCatalog(check_interval=0)
+    catalog.load(db)
+
+    # A database that hasn't caught up yet: one course and version 1
+    db.query(Course).filter(Course.title == "second").delete()
+    db.query(CatalogVersion).update({"version": 1})
+    db.commit()
+    catalog.ensure_fresh(db)
+
+    assert catalog.version == 2
+    assert catalog.total() == 2
+    db.close()
+
+def test_a_newer_shared_version_reloads_the_snapshot(test_db):
+    db = test_db.SessionLocal()
+    seed_published(db, ["first"], version=1)
+    catalog = PublishedCatalog(check_interval=0)
+    catalog.load(db)
+
+    seed_published(db, ["second"], version=2)
+    catalog.ensure_fresh(db)
+
+    assert catalog.version == 2
+    assert catalog.total() == 2
+    db.close()
@@ -0,0 +1,59 @@
+from models.models import Course, CourseLevel, TextContent, User
+from utils.search_index import SearchIndexSync, rebuild_search_index, search_index
+
+def add_course(db, title: str) -> Course:
+    instructor = db.query(User).first()
+    if instructor is None:
+        instructor = User(username="instructor", email="instructor@example.com", hashed_password="x")
+        db.add(instructor)
+        db.flush()
+    course = Course(
+        title=title, description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+        category="test", instructor_id=instructor.id
+    )
+    db.add(course)
+    db.commit()
+    return course
+
+def test_sync_picks_up_rows_written_by_another_worker(test_db):
+    db = test_db.SessionLocal()
+    add_course(db, "Indexed at startup")
+    rebuild_search_index(db)
+    sync = SearchIndexSync(check_interval=0)
+    sync.mark_synced(None)
+
+    # Written without touching this worker's index
+    course = add_course(db, "Nebula basics")
+    db.add(TextContent(course_id=course.id, raw_text="spectroscopy notes", formatted_text="x"))
+    db.commit()
+    assert search_index.search("nebula")[0] == 0
+
+    sync.ensure_fresh(db)
+    assert search_index.search("nebula")[1][0]["id"] == course.id
+    assert search_index.search("spectroscopy")[0] == 1
+
+    course.title = "Galaxy basics"
+    db.commit()
+    sync.ensure_fresh(db)
+    assert search_index.search("nebula")[0] == 0
+    assert search_index.search("galaxy")[0] == 1
+
+    db.query(TextContent).delete()
+    db.delete(course)
+    db.commit()
+    sync.ensure_fresh(db)
+    assert search_index.search("galaxy")[0] == 0
+    assert search_index.search("spectroscopy")[0] == 0
+    assert search_index.search("startup")[0] == 1
+    db.close()
+
+def test_sync_waits_for_its_interval(test_db):
+    db = test_db.SessionLocal()
+    rebuild_search_index(db)
+    sync = SearchIndexSync(check_interval=3600)
+    sync.mark_synced(None)
+
+    add_course(db, "Quiet comet")
+    sync.ensure_fresh(db)
+    assert search_index.search("comet")[0] == 0
+    db.close()
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from models.models import Course, CourseLevel, TextContentVersion, User
+from routers import text_content
+
+def seed_course(db) -> int:
+    instructor = User(username="instructor", email="instructor@example.com", hashed_password="x")
+    db.add(instructor)
+    db.flush()
+    course = Course(
+        title="Saved", description="d", duration_weeks=4, level=CourseLevel.BEGINNER,
+        category="test", instructor_id=instructor.id
+    )
+    db.add(course)
+    db.commit()
+    return course.id
+
+def test_first_save_creates_and_second_save_updates(test_db):
+    db = test_db.SessionLocal()
+    course_id = seed_course(db)
+
+    first = test_db.client.post("/text-contents/", json={"course_id": course_id, "raw_text": "one"})
+    second = test_db.client.post("/text-contents/", json={"course_id": course_id, "raw_text": "two"})
+
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] == second.json()["id"]
+    assert (first.json()["version"], second.json()["version"]) == (1, 2)
+    assert db.query(TextContentVersion).count() == 2
+    db.close()
+
+# Deadlock and lock wait timeout
+@pytest.mark.parametrize("code", [1213, 1205])
+def test_lock_conflicts_on_save_are_a_409(test_db, monkeypatch, code):
+    db = test_db.SessionLocal()
+    course_id = seed_course(db)
+    db.close()
+
+    def deadlock(*args, **kwargs):
+        raise OperationalError("INSERT", {}, Exception(code, "Deadlock found when trying to get lock"))
+    monkeypatch.setattr(text_content, "upsert_statement", deadlock)
+
+    response = test_db.client.post("/text-contents/", json={"course_id": course_id, "raw_text": "one"})
+    assert response.status_code == 409
+
+def test_other_operational_errors_are_not_a_409(test_db, monkeypatch):
+    db = test_db.SessionLocal()
+    course_id = seed_course(db)
+    db.close()
+
+    def gone_away(*args, **kwargs):
+        raise OperationalError("INSERT", {}, Exception(2006, "MySQL server has gone away"))
+    monkeypatch.setattr(text_content, "upsert_statement", gone_away)
+
+    with pytest.raises(OperationalError):
+        test_db.client.post("/text-contents/", json={"course_id": course_id, "raw_text": "one"})
@@ -0,0 +1,150 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models.models import ActivityTotal, DailyActivity, Enrollment, User
+from utils.upsert import upsert_statement
+
+ACTIVITY_COUNTERS = ("signups", "active_users", "logins", "enrollments", "completions")
+TOTAL_USERS = "total_users"
+ACTIVE_USERS = "active_users"
+
+def today() -> date:
+    return datetime.utcnow().date()
+
+def record_activity(db: Session, day: Optional[date] = None, **increments: int):
+    """
+    Add to the daily rollup inside the caller's transaction, e.g.
+    record_activity(db, signups=1). The row for the day is created on first use.
+    """
+    increments = {name: value for name, value in increments.items() if value}
+    if not increments:
+        return
+    row = {name: increments.get(name, 0) for name in ACTIVITY_COUNTERS}
+    row["day"] = day or today()
+    table = DailyActivity.__table__
+
+    def merge(proposed, greatest):
+        values = {name: table.c[name] + proposed[name] for name in increments}
+        values["updated_at"] = func.now()
+        return values
+
+    db.execute(upsert_statement(db, table, [row], ("day",), merge))
+
+def _live_total(name: str):
+    users = select(func.count(User.id))
+    if name == ACTIVE_USERS:
+        users = users.where(User.is_active == True)
+    return users.scalar_subquery()
+
+def adjust_totals(db: Session, **deltas: int):
+    """
+    Apply deltas to the running totals inside the caller's transaction. Call
+    it after making the change it counts: a total that has no row yet (the
+    app wrote before the rollup was seeded) is inserted as its live count
+    rather than the delta, so an unseeded start can't leave it wrong.
+    """
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    db.flush()
+    table = ActivityTotal.__table__
+    existing = {name for (name,) in db.query(ActivityTotal.name).filter(ActivityTotal.name.in_(deltas))}
+    for name, delta in deltas.items():
+        # A row another transaction inserts meanwhile still just gets the delta
+        value = delta if name in existing else _live_total(name)
+        db.execute(upsert_statement(
+            db, table, [{"name": name, "value": value}], ("name",),
+            lambda proposed, greatest: {"value": table.c.value + delta}
+        ))
+
+def read_totals(db: Session) -> Dict[str, int]:
+    return {name: value for name, value in db.query(ActivityTotal.name, ActivityTotal.value)}
+
+def _live_user_statistics(db: Session, first_day_of_month: date) -> dict:
+    return {
+        "total_users": db.query(func.count(User.id)).scalar(),
+        "active_users": db.query(func.count(User.id)).filter(User.is_active == True).scalar(),
+        "new_users_this_month": db.query(func.count(User.id)).filter(User.created_at >= first_day_of_month).scalar(),
+    }
+
+def user_statistics(db: Session) -> dict:
+    """
+    The /auth/statistics payload: two primary-key reads of the totals plus
+    at most 31 daily rows, however many users there are. Until the totals
+    have been seeded (by the migration, backfill_activity.py or the first
+    user write) it counts the users table directly.
+    """
+    totals = read_totals(db)
+    first_day_of_month = today().replace(day=1)
+    if not totals:
+        return _live_user_statistics(db, first_day_of_month)
+    new_users_this_month = db.query(func.coalesce(func.sum(DailyActivity.signups), 0)).filter(
+        DailyActivity.day >= first_day_of_month
+    ).scalar()
+    return {
+        "total_users": totals.get(TOTAL_USERS, 0),
+        "active_users": totals.get(ACTIVE_USERS, 0),
+        "new_users_this_month": int(new_users_this_month),
+    }
+
+def activity_series(db: Session, start: date, end: date) -> List[dict]:
+    """Daily counters from `start` to `end` inclusive, with empty days filled in."""
+    rows = {
+        row.day: row
+        for row in db.query(DailyActivity).filter(DailyActivity.day >= start, DailyActivity.day <= end)
+    }
+    series = []
+    day = start
+    while day <= end:
+        row = rows.get(day)
+        series.append({"day": day, **{name: getattr(row, name) if row else 0 for name in ACTIVITY_COUNTERS}})
+        day += timedelta(days=1)
+    return series
+
+def _counts_by_day(db: Session, column, *filters) -> Dict[date, int]:
+    day = func.date(column)
+    counts = {}
+    for value, count in db.query(day, func.count()).filter(column.isnot(None), *filters).group_by(day):
+        # SQLite returns DATE() as text
+        counts[date.fromisoformat(value) if isinstance(value, str) else value] = count
+    return counts
+
+def backfill_activity(db: Session, rebuild: bool = False) -> int:
+    """
+    Fill the daily rollup from the source tables and recompute the totals.
+    Returns the number of days written.
+
+    Days that already have a row were recorded incrementally and are exact,
+    so they are kept unless `rebuild` is set. The source tables only keep
+    each user's latest login, so backfilled days count one login per user,
+    and completions are dated by the enrollment's last update.
+    """
+    logins = _counts_by_day(db, User.last_login)
+    sources = {
+        "signups": _counts_by_day(db, User.created_at),
+        "active_users": logins,
+        "logins": logins,
+        "enrollments": _counts_by_day(db, Enrollment.created_at),
+        "completions": _counts_by_day(db, Enrollment.updated_at, Enrollment.completed == True),
+    }
+    days = set().union(*sources.values())
+    if rebuild:
+        db.query(DailyActivity).delete(synchronize_session=False)
+    else:
+        days -= {day for (day,) in db.query(DailyActivity.day)}
+    days = sorted(days)
+
+    # Totals are plain counts of the users table, so recomputing them is exact
+    db.query(ActivityTotal).delete(synchronize_session=False)
+    if days:
+        db.execute(DailyActivity.__table__.insert(), [
+            {"day": day, **{name: counts.get(day, 0) for name, counts in sources.items()}}
+            for day in days
+        ])
+    db.add_all([
+        ActivityTotal(name=TOTAL_USERS, value=db.query(func.count(User.id)).scalar()),
+        ActivityTotal(name=ACTIVE_USERS, value=db.query(func.count(User.id)).filter(User.is_active == True).scalar()),
+    ])
+    db.commit()
+    return len(days)
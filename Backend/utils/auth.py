@@ -7,7 +7,11 @@ from database.database import get_db
 from sqlalchemy.orm import Session
 from models.models import User, UserRole
 from schemas.schemas import TokenData
+from utils.cache import TTLCache
+from utils.catalog import bump_catalog_version, read_catalog_version
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 
@@ -18,6 +22,16 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Principal cache configuration
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+# How often a worker checks whether another worker changed a user; this
+# bounds how long a deactivated or demoted account keeps its cached access
+PRINCIPAL_VERSION_CHECK_SECONDS = float(os.getenv("PRINCIPAL_VERSION_CHECK_SECONDS", "1"))
+
+# Row in catalog_versions bumped by every user update and delete
+PRINCIPALS_VERSION = "principals"
+
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -50,6 +64,36 @@ def verify_token(token: str, credentials_exception):
     except JWTError:
         raise credentials_exception
 
+# Authenticated users keyed by username. Entries are detached copies, so they
+# never drag a closed session along and can't be flushed back by accident.
+# Other workers drop theirs once they see the shared principals version move.
+principal_cache = TTLCache(max_size=PRINCIPAL_CACHE_MAX_SIZE, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+_principals_seen = {"version": 0, "checked_at": float("-inf")}
+_principals_lock = threading.Lock()
+
+def _detached_principal(user: User) -> User:
+    return User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+def invalidate_principal(*usernames: str):
+    for username in usernames:
+        if username:
+            principal_cache.invalidate(username)
+
+def bump_principal_version(db: Session):
+    """Tell every worker a user changed; call inside the write's transaction."""
+    bump_catalog_version(db, PRINCIPALS_VERSION)
+
+def _drop_stale_principals(db: Session):
+    # At most one version read per interval, so cache hits stay query-free
+    if time.monotonic() - _principals_seen["checked_at"] < PRINCIPAL_VERSION_CHECK_SECONDS:
+        return
+    version = read_catalog_version(db, PRINCIPALS_VERSION)
+    with _principals_lock:
+        _principals_seen["checked_at"] = time.monotonic()
+        if version > _principals_seen["version"]:
+            _principals_seen["version"] = version
+            principal_cache.clear()
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,9 +101,17 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     token_data = verify_token(token, credentials_exception)
+
+    _drop_stale_principals(db)
+    user = principal_cache.get(token_data.username)
+    if user is not None:
+        return user
+
     user = db.query(User).filter(User.username == token_data.username).first()
     if user is None:
         raise credentials_exception
+    user = _detached_principal(user)
+    principal_cache.set(token_data.username, user)
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)):
@@ -0,0 +1,142 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from models.models import Course, CourseStatus, CatalogVersion
+from schemas.schemas import Course as CourseSchema
+from utils.logger import logger
+from utils.pagination import encode_cursor, decode_cursor
+
+load_dotenv()
+
+PUBLISHED_CATALOG = "published_courses"
+
+# How often a worker compares its snapshot version with the shared one
+CATALOG_VERSION_CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", "5"))
+
+def bump_catalog_version(db: Session, name: str = PUBLISHED_CATALOG) -> int:
+    """
+    Increment the shared catalog version inside the caller's transaction and
+    return the new value. The row lock serializes concurrent publishers.
+    """
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.name == name)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(CatalogVersion(name=name, version=1))
+        db.flush()
+    return db.query(CatalogVersion.version).filter(CatalogVersion.name == name).scalar()
+
+def read_catalog_version(db: Session, name: str = PUBLISHED_CATALOG) -> int:
+    version = db.query(CatalogVersion.version).filter(CatalogVersion.name == name).scalar()
+    return version or 0
+
+class PublishedCatalog:
+    """
+    In-memory snapshot of published courses, pre-serialized and ordered by id.
+
+    The routers patch it after every committed change to a published course.
+    Each change also bumps the shared row in `catalog_versions`; a worker whose
+    local version falls behind (another worker wrote) rebuilds from the DB.
+    """
+
+    def __init__(self, check_interval: float = CATALOG_VERSION_CHECK_SECONDS):
+        self.check_interval = check_interval
+        self.version = 0
+        self._courses: Dict[int, dict] = {}
+        self._ids: List[int] = []
+        self._loaded = False
+        self._stale = False
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        version = read_catalog_version(db)
+        courses = db.query(Course).filter(
+            Course.status == CourseStatus.PUBLISHED
+        ).order_by(Course.id).all()
+        snapshot = {course.id: CourseSchema.model_validate(course).model_dump() for course in courses}
+
+        with self._lock:
+            self._courses = snapshot
+            self._ids = list(snapshot)
+            self.version = version
+            self._loaded = True
+            self._stale = False
+            self._last_check = time.monotonic()
+        logger.info(f"Published catalog snapshot loaded: {len(snapshot)} courses at version {version}")
+
+    def ensure_fresh(self, db: Session):
+        if not self._loaded or self._stale:
+            self.load(db)
+            return
+        if time.monotonic() - self._last_check < self.check_interval:
+            return
+        shared_version = read_catalog_version(db)
+        self._last_check = time.monotonic()
+        # Only a newer version means another worker wrote; an older one read
+        # from a lagging database must not roll the snapshot back
+        if shared_version > self.version:
+            logger.info(f"Published catalog is stale (local {self.version}, shared {shared_version}), reloading")
+            self.load(db)
+
+    def apply(self, course_id: int, course: Optional[Course], version: int):
+        """
+        Patch one course into the snapshot after its change was committed.
+        Pass the refreshed course, or None when it was deleted.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            # Anything other than the next version means another worker also wrote
+            if version != self.version + 1:
+                self._stale = True
+            self.version = version
+
+            published = course is not None and course.status == CourseStatus.PUBLISHED
+            if published:
+                if course_id not in self._courses:
+                    bisect.insort(self._ids, course_id)
+                self._courses[course_id] = CourseSchema.model_validate(course).model_dump()
+            elif course_id in self._courses:
+                del self._courses[course_id]
+                self._ids.pop(bisect.bisect_left(self._ids, course_id))
+
+    def mark_stale(self):
+        """Force a rebuild on the next read, for bulk writes not worth patching in."""
+        with self._lock:
+            self._stale = True
+
+    def total(self) -> int:
+        return len(self._ids)
+
+    def page(self, skip: int, limit: int, cursor: Optional[str] = None, keyset: bool = False) -> Tuple[List[dict], Optional[str]]:
+        # Validated before the lock: decode_cursor raises a 400 for anything but
+        # an int id, which bisect would otherwise fail on with a TypeError
+        after_id = decode_cursor(cursor, (Course.id,))[0] if cursor else None
+        with self._lock:
+            if cursor or keyset:
+                start = 0
+                if after_id is not None:
+                    start = bisect.bisect_right(self._ids, after_id)
+                ids = self._ids[start:start + limit + 1]
+                next_cursor = encode_cursor([ids[limit - 1]]) if len(ids) > limit else None
+                return [self._courses[i] for i in ids[:limit]], next_cursor
+
+            return [self._courses[i] for i in self._ids[skip:skip + limit]], None
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "courses": len(self._ids),
+            "loaded": self._loaded,
+            "stale": self._stale,
+        }
+
+published_catalog = PublishedCatalog()
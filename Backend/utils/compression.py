@@ -0,0 +1,123 @@
+import base64
+import binascii
+import os
+import zlib
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import Text, select, type_coerce, update
+from sqlalchemy.orm import Session
+from sqlalchemy.types import TypeDecorator
+from utils.logger import logger
+
+load_dotenv()
+
+# Compression is opt-in; with it off, values are written as plain text and
+# anything already compressed still reads back
+TEXT_COMPRESSION_ENABLED = os.getenv("TEXT_COMPRESSION_ENABLED", "false").lower() == "true"
+TEXT_COMPRESSION_MIN_BYTES = int(os.getenv("TEXT_COMPRESSION_MIN_BYTES", "1024"))
+TEXT_COMPRESSION_LEVEL = int(os.getenv("TEXT_COMPRESSION_LEVEL", "6"))
+
+# Prefix of compressed values; rows without it are read as they are. Text
+# that itself starts with the marker is always stored compressed, so a
+# stored value with the marker is always a compressed payload.
+COMPRESSED_MARKER = "\x1fz1:"
+
+def is_compressed(value: Optional[str]) -> bool:
+    return value is not None and value.startswith(COMPRESSED_MARKER)
+
+def compress_text(value: str, min_bytes: Optional[int] = None) -> str:
+    """
+    Return the stored form of `value`: zlib-compressed and base64-encoded
+    behind the marker, or unchanged when it is short or compresses badly.
+    Values starting with the marker are always compressed, or they would be
+    mistaken for a payload on read.
+    """
+    min_bytes = TEXT_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    raw = value.encode("utf-8")
+    must_wrap = is_compressed(value)
+    if len(raw) < min_bytes and not must_wrap:
+        return value
+    packed = COMPRESSED_MARKER + base64.b64encode(zlib.compress(raw, TEXT_COMPRESSION_LEVEL)).decode("ascii")
+    return packed if must_wrap or len(packed) < len(raw) else value
+
+def decompress_text(value: Optional[str]) -> Optional[str]:
+    if not is_compressed(value):
+        return value
+    try:
+        return zlib.decompress(base64.b64decode(value[len(COMPRESSED_MARKER):], validate=True)).decode("utf-8")
+    except (binascii.Error, zlib.error, UnicodeDecodeError) as e:
+        # Written before marker-prefixed text was wrapped; serve it as stored
+        logger.warning(f"Stored text starts with the compression marker but is not a valid payload, returning it as is: {e}")
+        return value
+
+class CompressedText(TypeDecorator):
+    """
+    Text column that stores large values compressed.
+
+    The underlying column stays TEXT, so switching a column to this type
+    needs no DDL. Values are only compressed while TEXT_COMPRESSION_ENABLED
+    is set; reads always decompress. Equality filters still work, but LIKE
+    and length() see the stored form.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not TEXT_COMPRESSION_ENABLED:
+            # Marker-prefixed text is wrapped even with compression off
+            return compress_text(value, min_bytes=0) if is_compressed(value) else value
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+def convert_column(db: Session, column, batch_size: int = 500, decompress: bool = False) -> int:
+    """
+    Rewrite the existing rows of one CompressedText column in primary-key
+    batches, compressing them (or restoring plain text with `decompress`).
+    Each batch is committed on its own. Returns the number of rows rewritten.
+    """
+    table = column.table
+    primary_key = table.primary_key.columns.values()[0]
+    # Read and write the stored form, bypassing the type's own processing
+    stored = type_coerce(column, Text)
+
+    converted = 0
+    last_id = None
+    while True:
+        query = select(primary_key, stored).order_by(primary_key).limit(batch_size)
+        if last_id is not None:
+            query = query.where(primary_key > last_id)
+        rows = db.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        changes = []
+        for row_id, value in rows:
+            if value is None:
+                continue
+            if decompress:
+                new_value = decompress_text(value)
+                if is_compressed(new_value):
+                    # Marker-prefixed text has to stay wrapped
+                    continue
+            elif is_compressed(value):
+                continue
+            else:
+                new_value = compress_text(value)
+            if new_value != value:
+                changes.append((row_id, new_value))
+        for row_id, new_value in changes:
+            db.execute(
+                update(table)
+                .where(primary_key == row_id)
+                .values({column.key: type_coerce(new_value, Text)})
+            )
+        db.commit()
+        converted += len(changes)
+        logger.info(f"{table.name}.{column.key}: rewrote {len(changes)} of {len(rows)} rows up to id {last_id}")
+    return converted
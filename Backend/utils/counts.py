@@ -0,0 +1,75 @@
+import os
+from typing import Callable, Optional
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from utils.cache import TTLCache
+from utils.logger import logger
+
+load_dotenv()
+
+# Count modes accepted by the list endpoints
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_MODE_PATTERN = f"^({COUNT_EXACT}|{COUNT_ESTIMATE}|{COUNT_NONE})$"
+
+# Count cache configuration. Writes in this worker invalidate immediately;
+# the TTL bounds how long writes made by other workers go unnoticed.
+COUNT_CACHE_MAX_SIZE = int(os.getenv("COUNT_CACHE_MAX_SIZE", "1024"))
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+
+# Keys are (table_name, filter_key)
+count_cache = TTLCache(max_size=COUNT_CACHE_MAX_SIZE, ttl_seconds=COUNT_CACHE_TTL_SECONDS)
+
+def invalidate_counts(*table_names: str):
+    tables = set(table_names)
+    count_cache.invalidate_where(lambda key: key[0] in tables)
+
+def _table_statistics_estimate(db: Session, table_name: str) -> Optional[int]:
+    # MySQL keeps an approximate row count per table; other backends fall back to COUNT(*)
+    if db.get_bind().dialect.name != "mysql":
+        return None
+    try:
+        return db.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+            ),
+            {"table_name": table_name}
+        ).scalar()
+    except Exception as e:
+        logger.warning(f"Could not read row estimate for {table_name}: {str(e)}")
+        return None
+
+def resolve_total(
+    db: Session,
+    mode: str,
+    table_name: str,
+    count_query: Callable[[], int],
+    filter_key: str = ""
+) -> Optional[int]:
+    """
+    Total for a paginated response.
+
+    - exact: COUNT(*) cached per (table, filter) until the owning router writes
+    - estimate: any cached count, else table statistics for unfiltered
+      MySQL tables, else the exact count
+    - none: skip counting altogether
+    """
+    if mode == COUNT_NONE:
+        return None
+
+    key = (table_name, filter_key)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if mode == COUNT_ESTIMATE and not filter_key:
+        estimate = _table_statistics_estimate(db, table_name)
+        if estimate is not None:
+            return int(estimate)
+
+    total = count_query()
+    count_cache.set(key, total)
+    return total
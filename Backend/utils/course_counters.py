@@ -0,0 +1,134 @@
+import heapq
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from models.models import Course, CourseStatus, Enrollment
+from utils.logger import logger
+
+load_dotenv()
+
+# The ranking is patched in place by this worker's writes and reloaded from the
+# counters on this interval to pick up other workers' writes
+POPULAR_REFRESH_SECONDS = float(os.getenv("POPULAR_REFRESH_SECONDS", "60"))
+POPULAR_MAX_K = 100
+
+# Counter writes set updated_at to itself: it stays out of the ORM's
+# onupdate and MySQL's ON UPDATE CURRENT_TIMESTAMP, so an enrollment doesn't
+# change the course's ETag
+_KEEP_UPDATED_AT = {"updated_at": Course.__table__.c.updated_at}
+
+def adjust_course_counters(db: Session, course_id: int, enrolled: int = 0, completed: int = 0):
+    """
+    Apply a counter delta inside the caller's transaction. The increment runs
+    in SQL, so concurrent enrollments never overwrite each other's updates.
+    """
+    courses = Course.__table__
+    values = {}
+    if enrolled:
+        values["enrollment_count"] = courses.c.enrollment_count + enrolled
+    if completed:
+        values["completion_count"] = courses.c.completion_count + completed
+    if values:
+        db.execute(update(courses).where(courses.c.id == course_id).values(**values, **_KEEP_UPDATED_AT))
+
+def reconcile_course_counters(db: Session) -> int:
+    """
+    Recompute both counters from the enrollments table and fix any course
+    whose stored values drifted. Returns the number of courses repaired.
+    """
+    enrollments = (
+        select(func.count(Enrollment.id))
+        .where(Enrollment.course_id == Course.id)
+        .scalar_subquery()
+    )
+    completions = (
+        select(func.count(Enrollment.id))
+        .where(Enrollment.course_id == Course.id, Enrollment.completed == True)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Course)
+        .where((Course.enrollment_count != enrollments) | (Course.completion_count != completions))
+        .values(enrollment_count=enrollments, completion_count=completions, **_KEEP_UPDATED_AT)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+class PopularCourses:
+    """
+    Published courses ranked by enrollment count. Counter changes only touch
+    one entry; the top-K heap is rebuilt lazily on the next read.
+    """
+
+    def __init__(self, refresh_interval: float = POPULAR_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._entries: Dict[int, dict] = {}
+        self._top: Optional[List[dict]] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry(course) -> dict:
+        return {
+            "course_id": course.id,
+            "title": course.title,
+            "category": course.category,
+            "level": course.level,
+            "enrollment_count": course.enrollment_count or 0,
+            "completion_count": course.completion_count or 0,
+        }
+
+    def load(self, db: Session):
+        courses = db.query(
+            Course.id, Course.title, Course.category, Course.level,
+            Course.enrollment_count, Course.completion_count
+        ).filter(Course.status == CourseStatus.PUBLISHED).all()
+        with self._lock:
+            self._entries = {course.id: self._entry(course) for course in courses}
+            self._top = None
+            self._loaded_at = time.monotonic()
+        logger.info(f"Popular course ranking loaded with {len(courses)} published courses")
+
+    def ensure_fresh(self, db: Session):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_interval:
+            self.load(db)
+
+    def mark_stale(self):
+        self._loaded_at = None
+
+    def apply(self, course_id: int, course: Optional[Course]):
+        """Add, refresh or drop a course after its publish state or details changed."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if course is not None and course.status == CourseStatus.PUBLISHED:
+                self._entries[course_id] = self._entry(course)
+            else:
+                self._entries.pop(course_id, None)
+            self._top = None
+
+    def adjust(self, course_id: int, enrolled: int = 0, completed: int = 0):
+        with self._lock:
+            entry = self._entries.get(course_id)
+            if entry is None:
+                return
+            entry["enrollment_count"] += enrolled
+            entry["completion_count"] += completed
+            self._top = None
+
+    def top(self, k: int) -> List[dict]:
+        with self._lock:
+            if self._top is None:
+                self._top = heapq.nlargest(
+                    POPULAR_MAX_K,
+                    self._entries.values(),
+                    key=lambda entry: (entry["enrollment_count"], entry["completion_count"], -entry["course_id"])
+                )
+            return [dict(entry) for entry in self._top[:k]]
+
+popular_courses = PopularCourses()
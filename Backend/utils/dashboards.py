@@ -0,0 +1,18 @@
+import os
+from dotenv import load_dotenv
+from utils.cache import TTLCache
+
+load_dotenv()
+
+# Instructor dashboard cache configuration. Enrollment and course writes in this
+# worker invalidate immediately; the TTL covers writes made by other workers.
+DASHBOARD_CACHE_MAX_SIZE = int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", "2048"))
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+
+# Keys are instructor ids
+dashboard_cache = TTLCache(max_size=DASHBOARD_CACHE_MAX_SIZE, ttl_seconds=DASHBOARD_CACHE_TTL_SECONDS)
+
+def invalidate_instructor_dashboard(*instructor_ids: int):
+    for instructor_id in instructor_ids:
+        if instructor_id is not None:
+            dashboard_cache.invalidate(instructor_id)
@@ -0,0 +1,18 @@
+import os
+from dotenv import load_dotenv
+from utils.cache import TTLCache
+
+load_dotenv()
+
+# Per-user my-enrollments cache configuration. Enrollment writes invalidate the
+# user's pages immediately; the TTL bounds staleness from course edits and
+# from writes made by other workers.
+MY_ENROLLMENTS_CACHE_MAX_SIZE = int(os.getenv("MY_ENROLLMENTS_CACHE_MAX_SIZE", "10000"))
+MY_ENROLLMENTS_CACHE_TTL_SECONDS = float(os.getenv("MY_ENROLLMENTS_CACHE_TTL_SECONDS", "60"))
+
+# Keys are (user_id, status, cursor, limit)
+my_enrollments_cache = TTLCache(max_size=MY_ENROLLMENTS_CACHE_MAX_SIZE, ttl_seconds=MY_ENROLLMENTS_CACHE_TTL_SECONDS)
+
+def invalidate_my_enrollments(*user_ids: int):
+    users = set(user_ids)
+    my_enrollments_cache.invalidate_where(lambda key: key[0] in users)
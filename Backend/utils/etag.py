@@ -0,0 +1,22 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+from fastapi import Response, status
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the values that identify one representation."""
+    normalized = [part.isoformat() if isinstance(part, datetime) else part for part in parts]
+    digest = hashlib.sha256(repr(normalized).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
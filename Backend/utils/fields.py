@@ -0,0 +1,33 @@
+from typing import Iterable, List, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query, Session
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,title,status; defaults to all"
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """
+    Parse a `fields=` parameter into the column names to select. Returns None
+    when it is absent, meaning the full representation. `id` is always
+    included so rows stay addressable and pageable.
+    """
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}"
+        )
+    return list(dict.fromkeys(["id", *names]))
+
+def sparse_query(db: Session, model, fields: Sequence[str], extra: Iterable[str] = ()) -> Query:
+    """
+    Select only the requested columns (plus `extra` ones the endpoint needs,
+    e.g. for its ETag), so unrequested columns are never read.
+    """
+    names = dict.fromkeys([*fields, *extra])
+    return db.query(*[getattr(model, name) for name in names])
+
+def sparse_rows(rows, fields: Sequence[str]) -> List[dict]:
+    return [{name: getattr(row, name) for name in fields} for row in rows]
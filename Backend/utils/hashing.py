@@ -0,0 +1,97 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from utils.auth import verify_password, get_password_hash
+from utils.logger import logger
+
+load_dotenv()
+
+# Hashing pool configuration
+HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread")  # "thread" or "process"
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", "4"))
+HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", "32"))
+HASH_POOL_RETRY_AFTER_SECONDS = int(os.getenv("HASH_POOL_RETRY_AFTER_SECONDS", "1"))
+
+class HashingExecutor:
+    """
+    Runs bcrypt hashing and verification off the event loop.
+    At most `workers + max_queue` jobs are accepted at once; anything beyond
+    that is rejected immediately with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 4, max_queue: int = 32):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        # Only touched from the event loop thread, so no lock is needed
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hashing")
+            logger.info(f"Hashing pool started: {self.kind} pool with {self.workers} workers, queue limit {self.max_queue}")
+        return self._executor
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    async def run(self, func, *args):
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            logger.warning(f"Hashing pool saturated ({self._in_flight} jobs in flight), rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": str(HASH_POOL_RETRY_AFTER_SECONDS)},
+            )
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, func, *args)
+            self.completed += 1
+            return result
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queued": max(self._in_flight - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            logger.info("Hashing pool shut down")
+
+hashing_executor = HashingExecutor(
+    kind=HASH_POOL_KIND,
+    workers=HASH_POOL_WORKERS,
+    max_queue=HASH_POOL_MAX_QUEUE
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_executor.run(get_password_hash, password)
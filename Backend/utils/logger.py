@@ -41,5 +41,19 @@ def setup_logger():
 
     return logger
 
+# Slow statements also get their own file, one normalized statement per line;
+# they propagate to the main log as well
+def setup_slow_query_logger():
+    slow_query_logger = logging.getLogger("lms.sql")
+    file_handler = RotatingFileHandler(
+        filename=log_dir / "slow_queries.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    slow_query_logger.addHandler(file_handler)
+    return slow_query_logger
+
 # Create logger instance
-logger = setup_logger() 
\ No newline at end of file
+logger = setup_logger()
+slow_query_logger = setup_slow_query_logger() 
\ No newline at end of file
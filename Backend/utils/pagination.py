@@ -0,0 +1,95 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+# Pagination modes accepted by the list endpoints
+OFFSET_MODE = "offset"
+CURSOR_MODE = "cursor"
+PAGINATION_MODE_PATTERN = f"^({OFFSET_MODE}|{CURSOR_MODE})$"
+
+def encode_cursor(values: Sequence) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, key_columns: Sequence) -> list:
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor"
+    )
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise invalid_cursor
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise invalid_cursor
+
+    decoded = []
+    for column, value in zip(key_columns, values):
+        # The cursor is client input: every value must match its key column's
+        # type before it reaches the driver. bool is an int subclass, so it is
+        # rejected explicitly.
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise invalid_cursor
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is int and not isinstance(value, int):
+                raise invalid_cursor
+            elif python_type is float and not isinstance(value, (int, float)):
+                raise invalid_cursor
+            elif python_type is str and not isinstance(value, str):
+                raise invalid_cursor
+        except (ValueError, TypeError):
+            raise invalid_cursor
+        decoded.append(value)
+    return decoded
+
+def keyset_page(query: Query, key_columns: Sequence, limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page ordered by `key_columns`, e.g. (Course.id,) or
+    (Course.created_at, Course.id). The key must be unique, so always end it
+    with the primary key. Returns the rows and the cursor for the next page.
+    """
+    if cursor:
+        values = decode_cursor(cursor, key_columns)
+        if len(key_columns) == 1:
+            query = query.filter(key_columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*key_columns) > tuple_(*values))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.order_by(*key_columns).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in key_columns])
+    return rows, next_cursor
+
+def paginate(
+    query: Query,
+    key_columns: Sequence,
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    mode: str = OFFSET_MODE
+) -> Tuple[List, Optional[str]]:
+    """
+    Shared pagination for the list endpoints. Offset mode keeps the old
+    skip/limit behaviour; cursor mode (or any request carrying a cursor)
+    switches to keyset pagination, which stays fast on deep pages.
+    """
+    if cursor or mode == CURSOR_MODE:
+        return keyset_page(query, key_columns, limit, cursor)
+    # Explicit order so filtered pages don't follow whichever index the planner picks
+    return query.order_by(*key_columns).offset(skip).limit(limit).all(), None
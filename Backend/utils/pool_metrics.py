@@ -0,0 +1,67 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection and
+    how many gave up after pool_timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - started) * 1000
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.total_wait_ms += waited_ms
+                self.max_wait_ms = max(self.max_wait_ms, waited_ms)
+
+    def recreate(self):
+        # Called on dispose(); carry the counters over to the replacement pool
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.total_wait_ms = self.total_wait_ms
+        pool.max_wait_ms = self.max_wait_ms
+        return pool
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool, MeteredQueuePool):
+    """MeteredQueuePool for async engines."""
+
+def pool_stats(engine) -> dict:
+    """Live occupancy of an engine's pool, plus wait metrics when it is metered."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    if isinstance(pool, MeteredQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "avg_wait_ms": round(pool.total_wait_ms / pool.checkouts, 3) if pool.checkouts else 0.0,
+            "max_wait_ms": round(pool.max_wait_ms, 3),
+        })
+    return stats
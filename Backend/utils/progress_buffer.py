@@ -0,0 +1,172 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import case, tuple_, update
+from models.models import Enrollment
+from utils.logger import logger
+import database.database
+
+load_dotenv()
+
+# Write-behind configuration
+PROGRESS_FLUSH_INTERVAL_SECONDS = float(os.getenv("PROGRESS_FLUSH_INTERVAL_SECONDS", "5"))
+PROGRESS_FLUSH_MAX_ENTRIES = int(os.getenv("PROGRESS_FLUSH_MAX_ENTRIES", "1000"))
+PROGRESS_FLUSH_BATCH_SIZE = int(os.getenv("PROGRESS_FLUSH_BATCH_SIZE", "500"))
+
+class ProgressBuffer:
+    """
+    Write-behind buffer for enrollment progress.
+
+    Reports only overwrite the latest value per (user_id, course_id). The
+    buffer is written out as batched UPDATE statements every interval, when it
+    grows past `max_entries`, and on shutdown. Progress reported since the last
+    flush is lost if the process dies without shutting down cleanly.
+    """
+
+    def __init__(
+        self,
+        interval: float = PROGRESS_FLUSH_INTERVAL_SECONDS,
+        max_entries: int = PROGRESS_FLUSH_MAX_ENTRIES,
+        batch_size: int = PROGRESS_FLUSH_BATCH_SIZE
+    ):
+        self.interval = interval
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self._entries: Dict[Tuple[int, int], float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._size_flush_pending = False
+        # The loop only keeps weak references to tasks, so size-triggered
+        # flushes are held here until they finish
+        self._size_flushes: Set[asyncio.Task] = set()
+        # Metrics
+        self.reports = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, user_id: int, course_id: int, progress: float):
+        with self._lock:
+            key = (user_id, course_id)
+            if key in self._entries:
+                self.coalesced += 1
+            self._entries[key] = progress
+            self.reports += 1
+            over_threshold = len(self._entries) >= self.max_entries and not self._size_flush_pending
+            if over_threshold:
+                self._size_flush_pending = True
+
+        if over_threshold:
+            task = asyncio.get_running_loop().create_task(self.flush_async())
+            self._size_flushes.add(task)
+            task.add_done_callback(self._size_flushes.discard)
+
+    def _write(self, entries: Dict[Tuple[int, int], float]):
+        items = list(entries.items())
+        db = database.database.SessionLocal()
+        try:
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                keys = [key for key, _ in batch]
+                # One UPDATE per batch: a CASE picks each row's new value
+                progress_by_key = case(
+                    *[
+                        ((Enrollment.user_id == user_id) & (Enrollment.course_id == course_id), progress)
+                        for (user_id, course_id), progress in batch
+                    ],
+                    else_=Enrollment.progress
+                )
+                db.execute(
+                    update(Enrollment)
+                    .where(tuple_(Enrollment.user_id, Enrollment.course_id).in_(keys))
+                    .values(progress=progress_by_key)
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def flush(self) -> int:
+        """Write out everything buffered so far. Returns the number of entries written."""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._entries
+                self._entries = {}
+                self._size_flush_pending = False
+            if not pending:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                self._write(pending)
+            except Exception as e:
+                self.failed_flushes += 1
+                # Put the values back unless a newer report already replaced them
+                with self._lock:
+                    for key, progress in pending.items():
+                        self._entries.setdefault(key, progress)
+                logger.error(f"Error flushing {len(pending)} progress updates: {str(e)}")
+                return 0
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.rows_flushed += len(pending)
+            self.last_flush_ms = round(elapsed_ms, 2)
+            self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+            return len(pending)
+
+    async def flush_async(self) -> int:
+        # The write is blocking DB I/O, so keep it off the event loop
+        return await asyncio.to_thread(self.flush)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush_async()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Progress write-behind started: flush every {self.interval}s or at {self.max_entries} entries")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._size_flushes:
+            await asyncio.gather(*self._size_flushes)
+        flushed = await self.flush_async()
+        logger.info(f"Progress write-behind stopped, flushed {flushed} pending updates")
+
+    def stats(self) -> dict:
+        return {
+            "buffered_entries": len(self._entries),
+            "reports": self.reports,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "flush_interval_seconds": self.interval,
+            "flush_max_entries": self.max_entries,
+        }
+
+progress_buffer = ProgressBuffer()
@@ -0,0 +1,191 @@
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from utils.logger import logger, slow_query_logger
+
+# Per-request SQL instrumentation: query count, DB time and slowest
+# statements for every request, reported in a Server-Timing header
+SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# The same statement this many times in one request is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+SLOWEST_STATEMENTS_KEPT = 3
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|(?<!:):\w+|__\[POSTCOMPILE_\w+\]")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_REPEATED_GROUP = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals and bind parameters become ?,
+    and expanded IN lists or multi-row VALUES collapse, so executions that
+    differ only in their values compare equal.
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("?, ...", normalized)
+    normalized = _REPEATED_GROUP.sub(r"\1, ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+class RequestQueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements = Counter()
+        self.slowest = []
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+        self.slowest.append((elapsed_ms, statement))
+        if len(self.slowest) > SLOWEST_STATEMENTS_KEPT:
+            self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+            self.slowest.pop()
+
+    def repeated_statements(self):
+        """Statements run at least N_PLUS_ONE_THRESHOLD times, most repeated first."""
+        return [
+            (statement, count) for statement, count in self.statements.most_common()
+            if count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} {"query" if self.count == 1 else "queries"}"'
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+class EndpointQueryStats:
+    """Query counts and DB time aggregated per route, for /admin/db/queries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def add(self, endpoint: str, stats: RequestQueryStats, repeated: list):
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {
+                "requests": 0, "queries": 0, "max_queries": 0, "db_ms": 0.0,
+                "max_db_ms": 0.0, "n_plus_one_requests": 0, "repeated_statements": {}
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["db_ms"] += stats.total_ms
+            entry["max_db_ms"] = max(entry["max_db_ms"], stats.total_ms)
+            if repeated:
+                entry["n_plus_one_requests"] += 1
+                for statement, count in repeated:
+                    entry["repeated_statements"][statement] = max(entry["repeated_statements"].get(statement, 0), count)
+
+    def snapshot(self) -> list:
+        with self._lock:
+            endpoints = [
+                {
+                    "endpoint": endpoint,
+                    "requests": entry["requests"],
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "max_queries": entry["max_queries"],
+                    "avg_db_ms": round(entry["db_ms"] / entry["requests"], 3),
+                    "max_db_ms": round(entry["max_db_ms"], 3),
+                    "n_plus_one_requests": entry["n_plus_one_requests"],
+                    "repeated_statements": [
+                        {"statement": statement, "max_count": count}
+                        for statement, count in entry["repeated_statements"].items()
+                    ],
+                }
+                for endpoint, entry in self._endpoints.items()
+            ]
+        return sorted(endpoints, key=lambda entry: entry["avg_queries"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+endpoint_query_stats = EndpointQueryStats()
+
+# Registered on the Engine class, so every engine is covered: the primary,
+# the replicas and the sync side of the async engines
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if SQL_INSTRUMENTATION_ENABLED:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(normalize_statement(statement), elapsed_ms)
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(f"{elapsed_ms:.1f}ms {normalize_statement(statement)}")
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+# Requests that match no route (or only its path, with another method) share
+# one key, so probing random paths or methods can't grow endpoint_query_stats
+UNMATCHED_ENDPOINT = "<unmatched>"
+
+def _endpoint(scope) -> str:
+    route = scope.get("route")
+    if route is None or scope["method"] not in (getattr(route, "methods", None) or ()):
+        return UNMATCHED_ENDPOINT
+    return f"{scope['method']} {route.path}"
+
+class QueryStatsMiddleware:
+    """
+    Collects the SQL run while serving each request. Adds a Server-Timing
+    header with the query count and DB time, logs statements repeated often
+    enough to look like an N+1 pattern, and feeds endpoint_query_stats.
+    Queries made after the headers are sent (streamed bodies) are counted
+    in the aggregates but not in the header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"server-timing", stats.server_timing().encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            endpoint = _endpoint(scope)
+            repeated = stats.repeated_statements()
+            for statement, count in repeated:
+                logger.warning(f"Possible N+1 on {endpoint}: {count}x {statement}")
+            if stats.slowest and stats.total_ms >= SLOW_QUERY_MS:
+                slowest = "; ".join(f"{elapsed_ms:.1f}ms {statement}" for elapsed_ms, statement in sorted(stats.slowest, reverse=True))
+                slow_query_logger.warning(f"{endpoint}: {stats.count} queries, {stats.total_ms:.1f}ms in the database. Slowest: {slowest}")
+            endpoint_query_stats.add(endpoint, stats, repeated)
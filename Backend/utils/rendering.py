@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from utils.cache import TTLCache
+
+load_dotenv()
+
+# Rendered HTML keyed by a hash of the inputs. Entries never go stale, the TTL
+# only ages out content nobody renders any more.
+RENDER_CACHE_MAX_SIZE = int(os.getenv("RENDER_CACHE_MAX_SIZE", "512"))
+RENDER_CACHE_TTL_SECONDS = float(os.getenv("RENDER_CACHE_TTL_SECONDS", "3600"))
+
+render_cache = TTLCache(max_size=RENDER_CACHE_MAX_SIZE, ttl_seconds=RENDER_CACHE_TTL_SECONDS)
+
+_HEADING_RE = re.compile(r"^(#{1,3})\s+(.*)$")
+_UNORDERED_RE = re.compile(r"^[-*]\s+(.*)$")
+_ORDERED_RE = re.compile(r"^\d+[.)]\s+(.*)$")
+_QUOTE_RE = re.compile(r"^>\s?(.*)$")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_UNDERLINE_RE = re.compile(r"__(.+?)__")
+_ITALIC_RE = re.compile(r"\*(.+?)\*")
+
+_FONT_FAMILY_RE = re.compile(r"^[\w\s,'-]{1,100}$")
+_COLOR_RE = re.compile(r"^(#[0-9a-fA-F]{3,8}|[a-zA-Z]{1,20})$")
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    text = _BOLD_RE.sub(r"<b>\1</b>", text)
+    text = _UNDERLINE_RE.sub(r"<u>\1</u>", text)
+    return _ITALIC_RE.sub(r"<i>\1</i>", text)
+
+def _container_style(formatting_options: Optional[Dict[str, Any]]) -> str:
+    """Turn the editor's formatting options into CSS, dropping anything unsafe."""
+    options = formatting_options or {}
+    styles = []
+    font_size = options.get("font_size")
+    if isinstance(font_size, int) and 8 <= font_size <= 72:
+        styles.append(f"font-size: {font_size}px")
+    font_family = options.get("font_family")
+    if isinstance(font_family, str) and _FONT_FAMILY_RE.match(font_family):
+        styles.append(f"font-family: {font_family}")
+    color = options.get("color")
+    if isinstance(color, str) and _COLOR_RE.match(color):
+        styles.append(f"color: {color}")
+    return "; ".join(styles)
+
+def _render(raw_text: str, formatting_options: Optional[Dict[str, Any]]) -> str:
+    parts = []
+    open_list = None
+
+    def close_list():
+        nonlocal open_list
+        if open_list:
+            parts.append(f"</{open_list}>")
+            open_list = None
+
+    for line in raw_text.splitlines():
+        line = line.strip()
+        if not line:
+            close_list()
+            continue
+
+        for tag, pattern in (("ul", _UNORDERED_RE), ("ol", _ORDERED_RE)):
+            match = pattern.match(line)
+            if match:
+                if open_list != tag:
+                    close_list()
+                    parts.append(f"<{tag}>")
+                    open_list = tag
+                parts.append(f"<li>{_inline(match.group(1))}</li>")
+                break
+        else:
+            close_list()
+            heading = _HEADING_RE.match(line)
+            quote = _QUOTE_RE.match(line)
+            if heading:
+                level = len(heading.group(1))
+                parts.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+            elif quote:
+                parts.append(f"<blockquote>{_inline(quote.group(1))}</blockquote>")
+            else:
+                parts.append(f"<p>{_inline(line)}</p>")
+    close_list()
+
+    style = _container_style(formatting_options)
+    opening = f'<div style="{html.escape(style)}">' if style else "<div>"
+    # One block per line keeps the line deltas in the version history small
+    return "\n".join([opening, *parts, "</div>"])
+
+def render_key(raw_text: str, formatting_options: Optional[Dict[str, Any]]) -> str:
+    options = json.dumps(formatting_options or {}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{options}\0{raw_text}".encode()).hexdigest()
+
+def render_formatted_text(raw_text: Optional[str], formatting_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Render the HTML stored in TextContent.formatted_text from the raw text and
+    its formatting options. Lines become paragraphs; `#` headings, `-`/`1.`
+    lists, `>` quotes and **bold**/*italic*/__underline__ are recognised.
+    """
+    if raw_text is None:
+        return None
+    key = render_key(raw_text, formatting_options)
+    rendered = render_cache.get(key)
+    if rendered is None:
+        rendered = _render_and_cache(key, raw_text, formatting_options)
+    return rendered
+
+def _render_and_cache(key: str, raw_text: str, formatting_options: Optional[Dict[str, Any]]) -> str:
+    rendered = _render(raw_text, formatting_options)
+    render_cache.set(key, rendered)
+    return rendered
+
+async def render_formatted_text_async(raw_text: Optional[str], formatting_options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    if raw_text is None:
+        return None
+    key = render_key(raw_text, formatting_options)
+    rendered = render_cache.get(key)
+    if rendered is None:
+        # Long lessons take a while to render, so keep it off the event loop
+        rendered = await asyncio.to_thread(_render_and_cache, key, raw_text, formatting_options)
+    return rendered
@@ -0,0 +1,177 @@
+import hashlib
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from utils.logger import logger
+from utils.pool_metrics import pool_stats
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+REPLICA_STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+# HTTP methods that don't start a read-your-writes window
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+class DatabaseNode:
+    """One database server, reachable through a sync and an async engine."""
+
+    def __init__(self, name: str, engine, async_engine):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def checked_out(self, use_async: bool) -> int:
+        engine = self.async_engine.sync_engine if use_async else self.engine
+        return engine.pool.checkedout()
+
+class ReplicaRouter:
+    """
+    Picks the node that serves a read-only session: a live replica chosen by
+    round robin or by fewest checked-out connections, else the primary.
+
+    Clients that wrote within `read_your_writes_seconds` read from the
+    primary, so they never see a replica that hasn't caught up with their
+    own change. A replica that fails to connect is skipped for
+    `retry_seconds` and its reads fall back to the next candidate.
+    """
+
+    def __init__(
+        self,
+        primary: DatabaseNode,
+        replicas: List[DatabaseNode],
+        strategy: str = ROUND_ROBIN,
+        read_your_writes_seconds: float = 5.0,
+        retry_seconds: float = 30.0
+    ):
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy {strategy!r}; expected one of {', '.join(REPLICA_STRATEGIES)}")
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._turns = itertools.count()
+        self._down_until: Dict[str, float] = {}
+        self._recent_writers: Dict[str, float] = {}
+        self.reads = {node.name: 0 for node in [primary, *replicas]}
+        self.failovers = 0
+
+    @staticmethod
+    def client_key(authorization: Optional[str]) -> Optional[str]:
+        # Keyed on the bearer token: a client's writes and reads carry the same one
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode()).hexdigest()
+
+    def note_write(self, client_key: Optional[str]):
+        if client_key is None or not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[client_key] = now + self.read_your_writes_seconds
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {
+                    key: until for key, until in self._recent_writers.items() if until > now
+                }
+
+    def _wrote_recently(self, client_key: Optional[str]) -> bool:
+        if client_key is None:
+            return False
+        with self._lock:
+            until = self._recent_writers.get(client_key)
+        return until is not None and until > time.monotonic()
+
+    def candidates(self, client_key: Optional[str] = None, use_async: bool = False) -> List[DatabaseNode]:
+        """Nodes to try in order; always ends with the primary."""
+        if not self.replicas or self._wrote_recently(client_key):
+            return [self.primary]
+        now = time.monotonic()
+        with self._lock:
+            live = [node for node in self.replicas if self._down_until.get(node.name, 0) <= now]
+            turn = next(self._turns)
+        if live:
+            start = turn % len(live)
+            live = live[start:] + live[:start]
+        if self.strategy == LEAST_CONNECTIONS:
+            # Stable sort, so ties keep the round-robin order
+            live.sort(key=lambda node: node.checked_out(use_async))
+        return [*live, self.primary]
+
+    def _served(self, node: DatabaseNode):
+        with self._lock:
+            self.reads[node.name] += 1
+
+    def _failed(self, node: DatabaseNode, error: Exception):
+        with self._lock:
+            self._down_until[node.name] = time.monotonic() + self.retry_seconds
+            self.failovers += 1
+        logger.warning(f"Replica {node.name} unavailable, skipping it for {self.retry_seconds}s: {error}")
+
+    def read_session(self, client_key: Optional[str] = None):
+        for node in self.candidates(client_key):
+            db = node.session_factory()
+            if node is not self.primary:
+                try:
+                    # Check out a connection now, so a dead replica fails over here
+                    db.connection()
+                except DBAPIError as e:
+                    db.close()
+                    self._failed(node, e)
+                    continue
+            self._served(node)
+            db.info["node"] = node.name
+            return db
+
+    async def async_read_session(self, client_key: Optional[str] = None):
+        for node in self.candidates(client_key, use_async=True):
+            db = node.async_session_factory()
+            if node is not self.primary:
+                try:
+                    await db.connection()
+                except DBAPIError as e:
+                    await db.close()
+                    self._failed(node, e)
+                    continue
+            self._served(node)
+            db.info["node"] = node.name
+            return db
+
+    def primary_read_session(self):
+        """A read-only session on the primary, whatever the strategy."""
+        self._served(self.primary)
+        db = self.primary.session_factory()
+        db.info["node"] = self.primary.name
+        return db
+
+    def async_primary_read_session(self):
+        self._served(self.primary)
+        db = self.primary.async_session_factory()
+        db.info["node"] = self.primary.name
+        return db
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "read_your_writes_seconds": self.read_your_writes_seconds,
+                "recent_writers": sum(1 for until in self._recent_writers.values() if until > now),
+                "failovers": self.failovers,
+                "nodes": [
+                    {
+                        "name": node.name,
+                        "role": "primary" if node is self.primary else "replica",
+                        "available": self._down_until.get(node.name, 0) <= now,
+                        "reads": self.reads[node.name],
+                        "pool": pool_stats(node.engine),
+                    }
+                    for node in [self.primary, *self.replicas]
+                ],
+            }
@@ -0,0 +1,256 @@
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.models import Course, TextContent
+from utils.logger import logger
+
+load_dotenv()
+
+COURSE_DOC = "course"
+TEXT_CONTENT_DOC = "text_content"
+
+# How often a worker pulls in courses and text contents written by other
+# workers, and how far before its last sync it looks again, for writes that
+# committed late or landed in the same second
+SEARCH_SYNC_SECONDS = float(os.getenv("SEARCH_SYNC_SECONDS", "10"))
+SEARCH_SYNC_OVERLAP_SECONDS = float(os.getenv("SEARCH_SYNC_OVERLAP_SECONDS", "5"))
+
+# Field weights for course documents; a title match counts like two body matches
+COURSE_FIELD_WEIGHTS = {"title": 2.0, "category": 1.5, "description": 1.0}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+class InvertedIndex:
+    """
+    In-process inverted index with BM25 ranking.
+
+    Documents are keyed by (doc_type, id) and updated one at a time from the
+    write paths, so the index never needs a full rebuild after startup.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Tuple[str, int], float]] = defaultdict(dict)
+        self._doc_terms: Dict[Tuple[str, int], Counter] = {}
+        self._doc_lengths: Dict[Tuple[str, int], float] = {}
+        self._doc_meta: Dict[Tuple[str, int], dict] = {}
+        self._total_length = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def _remove_locked(self, key):
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(key)
+        self._doc_meta.pop(key, None)
+
+    def upsert(self, doc_type: str, doc_id: int, fields: Dict[str, Optional[str]], weights: Optional[Dict[str, float]] = None, meta: Optional[dict] = None):
+        terms: Counter = Counter()
+        for field, text in fields.items():
+            weight = (weights or {}).get(field, 1.0)
+            for token in tokenize(text):
+                terms[token] += weight
+
+        key = (doc_type, doc_id)
+        with self._lock:
+            self._remove_locked(key)
+            if not terms:
+                return
+            for term, frequency in terms.items():
+                self._postings[term][key] = frequency
+            self._doc_terms[key] = terms
+            self._doc_lengths[key] = sum(terms.values())
+            self._doc_meta[key] = meta or {}
+            self._total_length += self._doc_lengths[key]
+
+    def remove(self, doc_type: str, doc_id: int):
+        with self._lock:
+            self._remove_locked((doc_type, doc_id))
+
+    def doc_ids(self, doc_type: str) -> Set[int]:
+        with self._lock:
+            return {doc_id for kind, doc_id in self._doc_lengths if kind == doc_type}
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._doc_meta.clear()
+            self._total_length = 0.0
+
+    def search(self, query: str, limit: int = 20, skip: int = 0, doc_type: Optional[str] = None) -> Tuple[int, List[dict]]:
+        """Rank documents matching any query term. Returns (matches, hits)."""
+        query_terms = set(tokenize(query))
+        scores: Dict[Tuple[str, int], float] = defaultdict(float)
+
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if not doc_count or not query_terms:
+                return 0, []
+            avg_length = self._total_length / doc_count
+
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    if doc_type and key[0] != doc_type:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                    scores[key] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            top = heapq.nlargest(skip + limit, scores.items(), key=lambda item: (item[1], -item[0][1]))
+            hits = [
+                {"type": key[0], "id": key[1], "score": round(score, 4), **self._doc_meta.get(key, {})}
+                for key, score in top[skip:]
+            ]
+        return len(scores), hits
+
+search_index = InvertedIndex()
+
+def _last_write(db: Session) -> Optional[datetime]:
+    course_write = db.query(func.max(Course.updated_at)).scalar()
+    text_write = db.query(func.max(TextContent.updated_at)).scalar()
+    return max((write for write in (course_write, text_write) if write is not None), default=None)
+
+class SearchIndexSync:
+    """
+    Keeps this worker's index in step with writes made by other workers.
+
+    Writes patch the index of the worker that served them. Every
+    `check_interval` seconds a search also re-indexes the rows whose
+    updated_at moved since the last sync and drops documents whose rows are
+    gone, so another worker's changes show up within one interval.
+    """
+
+    def __init__(self, check_interval: float = SEARCH_SYNC_SECONDS, overlap_seconds: float = SEARCH_SYNC_OVERLAP_SECONDS):
+        self.check_interval = check_interval
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.synced_through: Optional[datetime] = None
+        self.syncs = 0
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def mark_synced(self, synced_through: Optional[datetime]):
+        self.synced_through = synced_through
+        self._last_check = time.monotonic()
+
+    def ensure_fresh(self, db: Session):
+        if time.monotonic() - self._last_check < self.check_interval:
+            return
+        # One sync at a time; concurrent searches go on with the current index
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self.sync(db)
+        finally:
+            self._lock.release()
+
+    def sync(self, db: Session):
+        # Taken before reading, so a document indexed after the read below
+        # started can't be mistaken for a deleted row
+        indexed_courses = search_index.doc_ids(COURSE_DOC)
+        indexed_text_contents = search_index.doc_ids(TEXT_CONTENT_DOC)
+        last_write = _last_write(db)
+
+        courses = db.query(Course.id, Course.title, Course.description, Course.category)
+        text_contents = db.query(TextContent.id, TextContent.course_id, TextContent.raw_text)
+        if self.synced_through is not None:
+            since = self.synced_through - self.overlap
+            courses = courses.filter(Course.updated_at >= since)
+            text_contents = text_contents.filter(TextContent.updated_at >= since)
+        updated = 0
+        for course in courses:
+            index_course(course)
+            updated += 1
+        for text_content in text_contents:
+            index_text_content(text_content)
+            updated += 1
+
+        deleted_courses = indexed_courses - {course_id for (course_id,) in db.query(Course.id)}
+        deleted_text_contents = indexed_text_contents - {text_content_id for (text_content_id,) in db.query(TextContent.id)}
+        for course_id in deleted_courses:
+            search_index.remove(COURSE_DOC, course_id)
+        for text_content_id in deleted_text_contents:
+            search_index.remove(TEXT_CONTENT_DOC, text_content_id)
+
+        self.syncs += 1
+        self.mark_synced(last_write or self.synced_through)
+        if updated or deleted_courses or deleted_text_contents:
+            logger.info(
+                f"Search index synced: {updated} documents re-indexed, "
+                f"{len(deleted_courses) + len(deleted_text_contents)} removed"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(search_index),
+            "synced_through": self.synced_through,
+            "syncs": self.syncs,
+        }
+
+search_index_sync = SearchIndexSync()
+
+def index_course(course: Course):
+    search_index.upsert(
+        COURSE_DOC,
+        course.id,
+        {"title": course.title, "description": course.description, "category": course.category},
+        weights=COURSE_FIELD_WEIGHTS,
+        meta={"course_id": course.id, "title": course.title},
+    )
+
+def index_text_content(text_content: TextContent):
+    search_index.upsert(
+        TEXT_CONTENT_DOC,
+        text_content.id,
+        {"raw_text": text_content.raw_text},
+        meta={"course_id": text_content.course_id},
+    )
+
+def remove_course(course_id: int, text_content_ids: List[int] = ()):
+    search_index.remove(COURSE_DOC, course_id)
+    for text_content_id in text_content_ids:
+        search_index.remove(TEXT_CONTENT_DOC, text_content_id)
+
+def rebuild_search_index(db: Session, batch_size: int = 1000):
+    # Read first, so writes made while the index builds are caught by the next sync
+    last_write = _last_write(db)
+    search_index.clear()
+    for course in db.query(Course).yield_per(batch_size):
+        index_course(course)
+    # Only the indexed columns; formatted_text is never needed here
+    text_contents = db.query(TextContent.id, TextContent.course_id, TextContent.raw_text)
+    for text_content in text_contents.yield_per(batch_size):
+        index_text_content(text_content)
+    search_index_sync.mark_synced(last_write)
+    logger.info(f"Search index rebuilt with {len(search_index)} documents")
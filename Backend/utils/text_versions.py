@@ -0,0 +1,175 @@
+import difflib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from models.models import TextContent, TextContentVersion
+
+load_dotenv()
+
+# A full snapshot is stored at least every N versions, which bounds how many
+# deltas a read has to replay
+TEXT_VERSION_SNAPSHOT_INTERVAL = int(os.getenv("TEXT_VERSION_SNAPSHOT_INTERVAL", "10"))
+
+def _lines(text: Optional[str]) -> List[str]:
+    return text.splitlines(keepends=True) if text else []
+
+def make_delta(base: Optional[str], target: Optional[str]) -> str:
+    """
+    Encode `target` as a line delta against `base`: a JSON list where [i, j]
+    copies base lines i..j-1 and a string is inserted as-is. JSON null stands
+    for a None target.
+    """
+    if target is None:
+        return json.dumps(None)
+    base_lines = _lines(base)
+    target_lines = _lines(target)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(target_lines[j1:j2]))
+    return json.dumps(ops, separators=(",", ":"))
+
+def apply_delta(base: Optional[str], delta: str) -> Optional[str]:
+    ops = json.loads(delta)
+    if ops is None:
+        return None
+    base_lines = _lines(base)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+def text_content_state(text_content: TextContent) -> dict:
+    """The versioned fields of a text content, captured before it is overwritten."""
+    return {
+        "version": text_content.version,
+        "raw_text": text_content.raw_text,
+        "formatted_text": text_content.formatted_text,
+        "formatting_options": text_content.formatting_options,
+        "published": text_content.published,
+    }
+
+def _snapshot(text_content_id: int, state: dict) -> TextContentVersion:
+    return TextContentVersion(text_content_id=text_content_id, is_snapshot=True, **state)
+
+def _history_positions(db: Session, text_content_ids: Sequence[int]) -> Dict[int, Tuple[int, int, int]]:
+    """
+    Latest version, last snapshot version and the number of deltas recorded
+    since that snapshot, for every text content that has history. One query.
+    """
+    latest = db.query(
+        TextContentVersion.text_content_id.label("text_content_id"),
+        func.max(TextContentVersion.version).label("latest_version"),
+        func.max(case((TextContentVersion.is_snapshot == True, TextContentVersion.version))).label("last_snapshot")
+    ).filter(
+        TextContentVersion.text_content_id.in_(text_content_ids)
+    ).group_by(TextContentVersion.text_content_id).subquery()
+
+    rows = db.query(
+        latest.c.text_content_id,
+        latest.c.latest_version,
+        latest.c.last_snapshot,
+        func.count(TextContentVersion.id)
+    ).outerjoin(
+        TextContentVersion,
+        (TextContentVersion.text_content_id == latest.c.text_content_id)
+        & (TextContentVersion.version > latest.c.last_snapshot)
+    ).group_by(latest.c.text_content_id, latest.c.latest_version, latest.c.last_snapshot).all()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+def record_version(db: Session, text_content: TextContent, previous: Optional[dict] = None):
+    """
+    Add a history row for the text content's current state inside the
+    caller's transaction. `previous` is the state this write replaced (see
+    text_content_state), or None for a new record.
+    """
+    record_versions(db, [(text_content, previous)])
+
+def record_versions(db: Session, changes: List[Tuple[TextContent, Optional[dict]]]):
+    """Batch form of record_version, with one history lookup for all changes."""
+    if any(text_content.id is None for text_content, _ in changes):
+        db.flush()
+    positions = _history_positions(db, [text_content.id for text_content, _ in changes])
+    for text_content, previous in changes:
+        _record(db, text_content, previous, positions.get(text_content.id, (None, None, 0)))
+
+def _record(db: Session, text_content: TextContent, previous: Optional[dict], position: Tuple[int, int, int]):
+    current = text_content_state(text_content)
+    latest_version, last_snapshot, chain_length = position
+
+    if latest_version is None and previous is not None and previous["version"] < current["version"]:
+        # First write since history was introduced: keep the state it replaces
+        db.add(_snapshot(text_content.id, previous))
+        latest_version = previous["version"]
+        chain_length = 0
+
+    # A delta is only valid against the version recorded just before it
+    if previous is None or latest_version != previous["version"]:
+        db.add(_snapshot(text_content.id, current))
+        return
+
+    raw_delta = make_delta(previous["raw_text"], current["raw_text"])
+    formatted_delta = make_delta(previous["formatted_text"], current["formatted_text"])
+    full_size = len(current["raw_text"] or "") + len(current["formatted_text"] or "")
+    if chain_length + 1 >= TEXT_VERSION_SNAPSHOT_INTERVAL or len(raw_delta) + len(formatted_delta) >= full_size:
+        db.add(_snapshot(text_content.id, current))
+        return
+
+    db.add(TextContentVersion(
+        text_content_id=text_content.id,
+        version=current["version"],
+        is_snapshot=False,
+        raw_text=raw_delta,
+        formatted_text=formatted_delta,
+        formatting_options=current["formatting_options"],
+        published=current["published"]
+    ))
+
+def load_version(db: Session, text_content_id: int, version: int) -> Optional[dict]:
+    """
+    Rebuild one version from the nearest snapshot at or before it plus the
+    deltas recorded after that snapshot. Returns None if it was never recorded.
+    """
+    snapshot_version = db.query(func.max(TextContentVersion.version)).filter(
+        TextContentVersion.text_content_id == text_content_id,
+        TextContentVersion.is_snapshot == True,
+        TextContentVersion.version <= version
+    ).scalar()
+    if snapshot_version is None:
+        return None
+
+    rows = db.query(TextContentVersion).filter(
+        TextContentVersion.text_content_id == text_content_id,
+        TextContentVersion.version >= snapshot_version,
+        TextContentVersion.version <= version
+    ).order_by(TextContentVersion.version).all()
+    if rows[-1].version != version:
+        return None
+
+    raw_text = formatted_text = None
+    for row in rows:
+        if row.is_snapshot:
+            raw_text, formatted_text = row.raw_text, row.formatted_text
+        else:
+            raw_text = apply_delta(raw_text, row.raw_text)
+            formatted_text = apply_delta(formatted_text, row.formatted_text)
+
+    target = rows[-1]
+    return {
+        "text_content_id": text_content_id,
+        "version": target.version,
+        "raw_text": raw_text,
+        "formatted_text": formatted_text,
+        "formatting_options": target.formatting_options,
+        "published": target.published,
+        "created_at": target.created_at,
+    }
@@ -0,0 +1,39 @@
+from typing import Callable, List, Sequence
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_INSERTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def upsert_statement(
+    db: Session,
+    table,
+    rows: List[dict],
+    conflict_columns: Sequence[str],
+    update_values: Callable
+):
+    """
+    Build one multi-row INSERT that updates rows already present: ON DUPLICATE
+    KEY UPDATE on MySQL, ON CONFLICT DO UPDATE on SQLite and PostgreSQL.
+    `conflict_columns` must be covered by a unique index.
+
+    `update_values(proposed, greatest)` returns the SET clause. `proposed`
+    refers to the values the conflicting row would have been inserted with,
+    and `greatest(a, b)` is the dialect's two-argument maximum.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}")
+    statement = _INSERTS[dialect](table).values(rows)
+
+    if dialect == "mysql":
+        return statement.on_duplicate_key_update(update_values(statement.inserted, func.greatest))
+    greatest = func.max if dialect == "sqlite" else func.greatest
+    return statement.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_=update_values(statement.excluded, greatest)
+    )
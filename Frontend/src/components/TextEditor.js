@@ -108,7 +108,7 @@ const TextEditor = () => {
       const textContent = {
         course_id: parseInt(selectedCourse),
         raw_text: rawText,
-        formatted_text: rawText,
+        formatting_options: formattingOptions,
         version: 1,
         published: isPublished
       };
@@ -143,7 +143,7 @@ const TextEditor = () => {
       const textContent = {
         course_id: parseInt(selectedCourse),
         raw_text: rawText,
-        formatted_text: rawText,
+        formatting_options: formattingOptions,
         version: 1,
         published: !isPublished
       };
@@ -182,11 +182,9 @@ const TextEditor = () => {
     if (Array.isArray(textContents)) {
       const courseContent = textContents.find(content => content.course_id === parseInt(courseId));
       if (courseContent) {
-        const tempDiv = document.createElement('div');
-        tempDiv.innerHTML = courseContent.formatted_text || courseContent.raw_text;
-        const plainText = tempDiv.textContent || tempDiv.innerText;
-        
-        const contentState = ContentState.createFromText(plainText);
+        // formatted_text is the server's HTML rendering, for previews only;
+        // the editor works on the raw markup so saving doesn't strip it
+        const contentState = ContentState.createFromText(courseContent.raw_text || '');
         setEditorState(EditorState.createWithContent(contentState));
         setIsPublished(courseContent.published);
         